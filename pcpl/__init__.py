@@ -0,0 +1,93 @@
+"""
+Prime-Compound Phase-Lane Token Protocol (PCPL) reference implementation.
+
+Submodules are imported on first attribute access, so `import pcpl` stays
+cheap and tools only pay for the pieces they use:
+- core: params, phase clock, schedule, lane tokens, device/provider cycles.
+- hashing: pluggable hash backends with per-role call counters.
+- validate: sequential 1-of-x, schedule and chaining checks.
+- checkpoint: DeviceState snapshots for long runs.
+- oracle: random-access route/token/schedule queries and sampled validation.
+- audit: bounded-memory token collision audit.
+- emitter: asyncio real-time paced device with jitter/deadline metrics.
+- farm: multi-process lane farm over shared-memory rings.
+- pipeline: device with routed tokens prefetched by a process pool.
+- forks: many forked token streams sharing the public per-cycle work.
+- attack: adversarial cross-lane attack-cost benchmark.
+- cli, trace, worker: command-line entry points.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Dict, List
+
+_SUBMODULES = ("attack", "audit", "checkpoint", "cli", "core", "emitter", "farm", "forks", "hashing", "oracle", "pipeline", "trace", "validate", "worker")
+
+_EXPORTS: Dict[str, str] = {
+    # core
+    "PRIME_POOL": "core",
+    "PERM_TABLE_24": "core",
+    "Params": "core",
+    "Phase": "core",
+    "ProviderSecrets": "core",
+    "CompoundConfig": "core",
+    "DeviceState": "core",
+    "h_bytes": "hashing",
+    "derive_seed": "core",
+    "trunc_bits": "core",
+    "build_params": "core",
+    "build_compound_config": "core",
+    "build_fixture": "core",
+    "phase_clock": "core",
+    "phase_range": "core",
+    "PhaseClock": "core",
+    "shared_phase_clock": "core",
+    "permutation_for_block": "core",
+    "device_destination_provider": "core",
+    "lane_token": "core",
+    "provider_cycle": "core",
+    "device_cycle": "core",
+    "device_route_token": "core",
+    "device_evolve": "core",
+    "evolve_seed": "core",
+    "lane_token_from_values": "core",
+    "schedule_period": "core",
+    # hashing
+    "HASH_BACKENDS": "hashing",
+    "get_backend": "hashing",
+    # validate
+    "validate_permutation": "validate",
+    "validate_cycles": "validate",
+    "validate_chaining": "validate",
+    "fast_forward": "validate",
+    # checkpoint
+    "save_checkpoint": "checkpoint",
+    "load_latest_checkpoint": "checkpoint",
+    # oracle
+    "CycleOracle": "oracle",
+    "validate_sampled": "oracle",
+    # pipeline
+    "PipelinedDevice": "pipeline",
+    # forks
+    "ForkEngine": "forks",
+    "build_forks": "forks",
+    # audit
+    "collision_audit": "audit",
+    "collision_report": "audit",
+}
+
+
+def __getattr__(name: str) -> object:
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_SUBMODULES) | set(_EXPORTS))
@@ -0,0 +1,419 @@
+"""
+Adversarial cross-lane attack-cost benchmark.
+
+A malicious provider knows its own ProviderSecrets, the CompoundConfig (prime
+pool and compound generator) and every public phase value, and has observed a
+few tokens routed to a target lane. It searches bouquet guesses built from the
+compound candidate space until one reproduces the observed tokens and enough
+held-out tokens that a chance match is negligible. Exponents and per-candidate powers depend only on public data,
+so they are precomputed once; each guess then costs the bouquet products plus
+the KDF and TOK hashes, which is the cost floor for this attacker.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .cli import build_parser, build_setup
+from .core import (
+    CompoundConfig,
+    Params,
+    Phase,
+    ProviderSecrets,
+    backend_for,
+    device_destination_provider,
+    exponent_vector,
+    lane_token,
+    phase_clock,
+    trunc_bits,
+)
+
+BLEND_WEIGHTS = (("classic", 0.5), ("prime-power", 0.2), ("semiprime", 0.15), ("offset", 0.15))
+MAX_DISTRIBUTION_TERMS = 2_000_000
+# Extra bits of token evidence beyond log2(space) a hit must match before it is
+# reported, so a chance match survives with probability about 2^-32.
+CONFIRM_MARGIN_BITS = 32
+
+
+@dataclass(frozen=True)
+class Observation:
+    t: int
+    phase: Phase
+    token: int
+
+
+@dataclass(frozen=True)
+class AttackContext:
+    params: Params
+    target: int
+    num_compounds: int
+    candidates: Tuple[int, ...]
+    observations: Tuple[Observation, ...]
+    holdouts: Tuple[Observation, ...]
+    # pow_tables[obs][bouquet][j][c] = candidates[c] ** e_j mod M for that phase,
+    # observations first, then holdouts.
+    pow_tables: Tuple[Tuple[Tuple[Tuple[int, ...], ...], ...], ...]
+    strategy: str
+    seed: int
+
+
+@dataclass
+class AttackResult:
+    guesses: int
+    elapsed: float
+    false_positives: int
+    success_index: Optional[int]
+    success_guess: Optional[Tuple[int, ...]]
+
+    @property
+    def rate(self) -> float:
+        return self.guesses / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+def _mode_distribution(mode: str, cfg: CompoundConfig) -> Dict[int, float]:
+    pool = list(cfg.prime_pool)
+    if mode in ("classic", "offset"):
+        exps = range(cfg.exponent_min, cfg.exponent_max + 1)
+        terms = (len(pool) * len(exps)) ** cfg.primes_per_compound
+        if terms > MAX_DISTRIBUTION_TERMS:
+            raise ValueError(f"Compound space too large to enumerate ({terms} terms)")
+        weight = 1.0 / terms
+        dist: Dict[int, float] = {}
+        for picks in itertools.product(itertools.product(pool, exps), repeat=cfg.primes_per_compound):
+            value = math.prod(p**e for p, e in picks)
+            dist[value] = dist.get(value, 0.0) + weight
+        if mode == "offset" and cfg.offset_max > 0:
+            shifted: Dict[int, float] = {}
+            for value, prob in dist.items():
+                for off in range(1, cfg.offset_max + 1):
+                    shifted[value + off] = shifted.get(value + off, 0.0) + prob / cfg.offset_max
+            dist = shifted
+        return dist
+    if mode == "prime-power":
+        exps = range(max(2, cfg.exponent_min), cfg.exponent_max + 1)
+        weight = 1.0 / (len(pool) * len(exps))
+        dist = {}
+        for p in pool:
+            for e in exps:
+                dist[p**e] = dist.get(p**e, 0.0) + weight
+        return dist
+    if mode == "semiprime":
+        weight = 1.0 / (len(pool) ** 2)
+        dist = {}
+        for a in pool:
+            for b in pool:
+                dist[a * b] = dist.get(a * b, 0.0) + weight
+        return dist
+    raise ValueError(f"Unknown compound mode: {mode}")
+
+
+def compound_distribution(cfg: CompoundConfig) -> Dict[int, float]:
+    """Prior over single compounds implied by the public compound generator."""
+    if cfg.mode != "blend":
+        return _mode_distribution(cfg.mode, cfg)
+    dist: Dict[int, float] = {}
+    for mode, weight in BLEND_WEIGHTS:
+        for value, prob in _mode_distribution(mode, cfg).items():
+            dist[value] = dist.get(value, 0.0) + weight * prob
+    return dist
+
+
+def rank_candidates(cfg: CompoundConfig, own: ProviderSecrets, strategy: str) -> Tuple[int, ...]:
+    """Order candidate compounds for the search strategy (most likely first)."""
+    dist = compound_distribution(cfg)
+    if strategy == "own-first":
+        seen = set(own.bouquetA) | set(own.bouquetB) | set(own.bouquetC)
+        return tuple(sorted(dist, key=lambda v: (v not in seen, -dist[v], v)))
+    return tuple(sorted(dist, key=lambda v: (-dist[v], v)))
+
+
+def holdout_count(space: int, token_bits: int, observed: int) -> int:
+    """Held-out tokens needed so observed + held-out bits cover log2(space) plus the margin."""
+    needed = math.ceil((math.log2(max(2, space)) + CONFIRM_MARGIN_BITS) / token_bits)
+    return max(1, needed - observed)
+
+
+def observe_target(
+    params: Params,
+    perm_key: bytes,
+    target_secrets: ProviderSecrets,
+    target: int,
+    count: int,
+) -> List[Observation]:
+    """Collect the first `count` tokens the device routes to the target lane."""
+    out = []
+    t = 0
+    while len(out) < count:
+        if device_destination_provider(t, params, perm_key) == target:
+            phase = phase_clock(t, params)
+            out.append(Observation(t, phase, lane_token(target, t, phase, params, target_secrets)))
+        t += 1
+    return out
+
+
+def build_context(
+    params: Params,
+    cfg: CompoundConfig,
+    candidates: Tuple[int, ...],
+    target: int,
+    observations: Sequence[Observation],
+    holdouts: Sequence[Observation],
+    strategy: str,
+    seed: int,
+) -> AttackContext:
+    if any(c % params.M == 0 for c in candidates):
+        raise ValueError("Candidate compound divisible by M")
+    tables = []
+    for obs in (*observations, *holdouts):
+        per_bouquet = []
+        for res, u in ((obs.phase.a, obs.phase.u1), (obs.phase.b, obs.phase.u2), (obs.phase.c, obs.phase.u3)):
+            exps = exponent_vector(cfg.num_compounds, res, u, params)
+            per_bouquet.append(tuple(tuple(pow(c, e, params.M) for c in candidates) for e in exps))
+        tables.append(tuple(per_bouquet))
+    return AttackContext(
+        params=params,
+        target=target,
+        num_compounds=cfg.num_compounds,
+        candidates=candidates,
+        observations=tuple(observations),
+        holdouts=tuple(holdouts),
+        pow_tables=tuple(tables),
+        strategy=strategy,
+        seed=seed,
+    )
+
+
+def search_space(ctx: AttackContext) -> int:
+    return len(ctx.candidates) ** (3 * ctx.num_compounds)
+
+
+def decode_guess(ctx: AttackContext, index: int) -> Tuple[int, ...]:
+    """Mixed-radix digits (candidate ranks), most significant position first."""
+    base = len(ctx.candidates)
+    digits = []
+    for _ in range(3 * ctx.num_compounds):
+        index, digit = divmod(index, base)
+        digits.append(digit)
+    return tuple(reversed(digits))
+
+
+def _token_for_digits(ctx: AttackContext, obs_idx: int, obs: Observation, digits: Tuple[int, ...]) -> int:
+    params = ctx.params
+    nc = ctx.num_compounds
+    table = ctx.pow_tables[obs_idx]
+    accs = []
+    for b in range(3):
+        acc = 1
+        for j in range(nc):
+            acc = (acc * table[b][j][digits[b * nc + j]]) % params.M
+        accs.append(acc)
+    h = backend_for(params).h
+    kdf = h(ctx.target, accs[0], accs[1], accs[2], obs.phase.phi, "KDF", out_len=32)
+    tok_hash = h(kdf, obs.t, obs.phase.phi, "TOK", out_len=max(32, params.token_bytes))
+    return trunc_bits(tok_hash, params.token_bits)
+
+
+def _chunk_indices(ctx: AttackContext, start: int, count: int) -> Sequence[int]:
+    if ctx.strategy == "random":
+        rng = random.Random(ctx.seed ^ start)
+        space = search_space(ctx)
+        return [rng.randrange(space) for _ in range(count)]
+    return range(start, min(start + count, search_space(ctx)))
+
+
+_WORKER_CTX: Optional[AttackContext] = None
+
+
+def _init_worker(ctx: AttackContext) -> None:
+    global _WORKER_CTX
+    _WORKER_CTX = ctx
+
+
+def search_chunk(
+    start: int,
+    count: int,
+    ctx: Optional[AttackContext] = None,
+) -> Tuple[int, int, List[int], Optional[int]]:
+    """Try guesses [start, start + count); return (start, tried, false-positive indices, hit).
+
+    A guess that reproduces the observed tokens but misses any held-out token
+    is a false positive.
+    """
+    ctx = ctx or _WORKER_CTX
+    assert ctx is not None
+    tried = 0
+    false_positives: List[int] = []
+    base = len(ctx.observations)
+    for position, index in enumerate(_chunk_indices(ctx, start, count)):
+        tried += 1
+        digits = decode_guess(ctx, index)
+        if all(
+            _token_for_digits(ctx, k, obs, digits) == obs.token
+            for k, obs in enumerate(ctx.observations)
+        ):
+            if all(
+                _token_for_digits(ctx, base + k, obs, digits) == obs.token
+                for k, obs in enumerate(ctx.holdouts)
+            ):
+                return start, tried, false_positives, start + position
+            false_positives.append(start + position)
+    return start, tried, false_positives, None
+
+
+def run_attack(
+    ctx: AttackContext,
+    max_guesses: int,
+    workers: int = 1,
+    chunk_size: int = 2048,
+) -> AttackResult:
+    """Search in index order across a process pool; stop at the first real success.
+
+    Chunks are submitted in index order, so once a hit is found every chunk
+    below it is already queued or running; those are drained before reporting
+    and later ones are dropped. Guesses and false positives are counted only up
+    to the reported index, matching a sequential search.
+    """
+    limit = max_guesses if ctx.strategy == "random" else min(max_guesses, search_space(ctx))
+    chunks = [(start, min(chunk_size, limit - start)) for start in range(0, limit, chunk_size)]
+    guesses = 0
+    false_positives: List[int] = []
+    hits: List[int] = []
+    began = time.perf_counter()
+    if workers <= 1:
+        for start, count in chunks:
+            _, tried, fps, hit = search_chunk(start, count, ctx)
+            guesses += tried
+            false_positives.extend(fps)
+            if hit is not None:
+                hits.append(hit)
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(ctx,)) as pool:
+            pending: Dict[Future, int] = {}
+            queue = iter(chunks)
+
+            def submit(n: int) -> None:
+                for start, count in itertools.islice(queue, n):
+                    pending[pool.submit(search_chunk, start, count)] = start
+
+            submit(workers * 4)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del pending[future]
+                    _, tried, fps, hit = future.result()
+                    guesses += tried
+                    false_positives.extend(fps)
+                    if hit is not None:
+                        hits.append(hit)
+                if hits:
+                    best = min(hits)
+                    for future, start in list(pending.items()):
+                        if start > best:
+                            future.cancel()
+                            del pending[future]
+                else:
+                    submit(len(done))
+    elapsed = time.perf_counter() - began
+    success = min(hits) if hits else None
+    guess = None
+    if success is not None:
+        guesses = success + 1
+        false_positives = [index for index in false_positives if index < success]
+        index = _chunk_indices(ctx, success - success % chunk_size, chunk_size)[success % chunk_size]
+        guess = tuple(ctx.candidates[d] for d in decode_guess(ctx, index))
+    return AttackResult(
+        guesses=guesses,
+        elapsed=elapsed,
+        false_positives=len(false_positives),
+        success_index=success,
+        success_guess=guess,
+    )
+
+
+def attack_report(ctx: AttackContext, result: AttackResult, workers: int) -> None:
+    space = search_space(ctx)
+    rate = result.rate
+    print(
+        f"attack: target={ctx.target} strategy={ctx.strategy} candidates={len(ctx.candidates)} "
+        f"positions={3 * ctx.num_compounds} space~2^{math.log2(space):.1f} "
+        f"token_bits={ctx.params.token_bits} observed={len(ctx.observations)} held_out={len(ctx.holdouts)}"
+    )
+    if (len(ctx.observations) + 1) * ctx.params.token_bits <= math.log2(space):
+        print(
+            f"attack: warning: {len(ctx.observations)} observed token(s) of {ctx.params.token_bits} bits "
+            f"cannot single out a key in 2^{math.log2(space):.1f}; expect false positives "
+            "until the held-out tokens reject them"
+        )
+    print(
+        f"attack: workers={workers} guesses={result.guesses} elapsed={result.elapsed:.3f}s "
+        f"rate={rate:.0f} guesses/s ({rate / max(1, workers):.0f}/worker) "
+        f"false_positives={result.false_positives}"
+    )
+    if result.success_index is not None:
+        print(f"attack: success at guess #{result.success_index + 1} bouquets={list(result.success_guess or ())}")
+    else:
+        print("attack: no success within the guess budget")
+    if rate > 0:
+        print(f"attack: est. time to exhaust space={space / rate:.3e}s (expected half that)")
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = build_parser()
+    parser.description = "PCPL adversarial cross-lane attack-cost benchmark."
+    parser.add_argument("--attacker", type=int, default=0, help="Lane of the malicious provider.")
+    parser.add_argument("--target", type=int, default=1, help="Lane whose tokens are attacked.")
+    parser.add_argument(
+        "--observed",
+        type=int,
+        default=2,
+        help="Target tokens observed (held-out tokens are added to confirm hits).",
+    )
+    parser.add_argument(
+        "--strategy",
+        choices=("own-first", "prior", "random"),
+        default="own-first",
+        help="Guess ordering: own compounds first, by generator prior, or uniform random.",
+    )
+    parser.add_argument("--max-guesses", type=int, default=1_000_000, help="Guess budget.")
+    parser.add_argument("--workers", type=int, default=1, help="Search processes.")
+    parser.add_argument("--chunk-size", type=int, default=2048, help="Guesses per work item.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    params, compound_cfg, secrets, state = build_setup(args)
+    if not (0 <= args.attacker < params.x and 0 <= args.target < params.x) or args.attacker == args.target:
+        raise ValueError("attacker and target must be distinct lanes in [0, x)")
+    if args.observed < 1:
+        raise ValueError("observed must be at least 1")
+    candidates = rank_candidates(compound_cfg, secrets[args.attacker], args.strategy)
+    space = len(candidates) ** (3 * compound_cfg.num_compounds)
+    held_out = holdout_count(space, params.token_bits, args.observed)
+    observations = observe_target(
+        params, state.perm_key, secrets[args.target], args.target, args.observed + held_out
+    )
+    ctx = build_context(
+        params,
+        compound_cfg,
+        candidates,
+        args.target,
+        observations[: args.observed],
+        observations[args.observed :],
+        args.strategy,
+        args.seed,
+    )
+    result = run_attack(ctx, args.max_guesses, workers=args.workers, chunk_size=args.chunk_size)
+    attack_report(ctx, result, args.workers)
+
+
+if __name__ == "__main__":
+    main()
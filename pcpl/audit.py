@@ -0,0 +1,299 @@
+"""
+Bounded-memory collision audit over every lane token of a long run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import math
+import os
+import struct
+import tempfile
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .core import Params, ProviderSecrets, phase_clock, provider_cycle
+
+
+def iter_lane_tokens(
+    params: Params,
+    secrets: List[ProviderSecrets],
+    start: int,
+    cycles: int,
+) -> Iterator[Tuple[int, int, int]]:
+    """Yield (t, lane, token) for every provider lane over [start, start + cycles)."""
+    for t in range(start, start + cycles):
+        phase = phase_clock(t, params)
+        for lane in range(params.x):
+            yield t, lane, provider_cycle(t, lane, params, secrets[lane], phase=phase)
+
+
+class BloomFilter:
+    """Fixed-size front-stage filter; degrades to an exact bitmap for small tokens."""
+
+    def __init__(self, token_bits: int, max_bytes: int, hashes: int = 4) -> None:
+        if max_bytes <= 0:
+            raise ValueError("Bloom filter size must be positive")
+        self.exact = token_bits <= (max_bytes * 8).bit_length() - 1
+        self.size_bits = (1 << token_bits) if self.exact else max_bytes * 8
+        self.hashes = 1 if self.exact else max(1, hashes)
+        self.token_bytes = (token_bits + 7) // 8
+        self.bits = bytearray((self.size_bits + 7) // 8)
+
+    def _indices(self, token: int) -> Iterator[int]:
+        if self.exact:
+            yield token
+            return
+        digest = hashlib.blake2b(token.to_bytes(self.token_bytes, "big"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        for k in range(self.hashes):
+            yield (h1 + k * h2) % self.size_bits
+
+    def add(self, token: int) -> bool:
+        """Insert token; return True if it was (possibly) present already."""
+        present = True
+        for index in self._indices(token):
+            byte, mask = index >> 3, 1 << (index & 7)
+            if not self.bits[byte] & mask:
+                present = False
+                self.bits[byte] |= mask
+        return present
+
+    def __contains__(self, token: int) -> bool:
+        return all(self.bits[i >> 3] & (1 << (i & 7)) for i in self._indices(token))
+
+
+class RunSpiller:
+    """External-memory sort: bounded in-memory buffer spilled to sorted run files."""
+
+    def __init__(self, workdir: str, token_bytes: int, buffer_records: int, fan_in: int = 64) -> None:
+        self.workdir = workdir
+        self.record = struct.Struct(f">{token_bytes}sQI")
+        self.buffer_records = max(1, buffer_records)
+        self.fan_in = max(2, fan_in)
+        self.buffer: List[bytes] = []
+        self.runs: List[str] = []
+        self.spilled = 0
+
+    def add(self, token: int, t: int, lane: int) -> None:
+        token_raw = token.to_bytes(self.record.size - 12, "big")
+        self.buffer.append(self.record.pack(token_raw, t, lane))
+        if len(self.buffer) >= self.buffer_records:
+            self._flush()
+
+    def _new_run_path(self) -> str:
+        return os.path.join(self.workdir, f"run-{len(self.runs):06d}-{self.spilled:012d}.bin")
+
+    def _flush(self) -> None:
+        if not self.buffer:
+            return
+        self.buffer.sort()
+        path = self._new_run_path()
+        with open(path, "wb") as handle:
+            handle.write(b"".join(self.buffer))
+        self.spilled += len(self.buffer)
+        self.runs.append(path)
+        self.buffer = []
+
+    def _read_run(self, path: str) -> Iterator[bytes]:
+        size = self.record.size
+        with open(path, "rb") as handle:
+            while True:
+                chunk = handle.read(size * 4096)
+                if not chunk:
+                    return
+                for offset in range(0, len(chunk), size):
+                    yield chunk[offset:offset + size]
+
+    def _merge_runs(self, paths: List[str]) -> str:
+        out_path = os.path.join(self.workdir, f"merge-{len(self.runs):06d}-{self.spilled:012d}.bin")
+        self.spilled += 1
+        with open(out_path, "wb") as handle:
+            for record in heapq.merge(*(self._read_run(p) for p in paths)):
+                handle.write(record)
+        for path in paths:
+            os.remove(path)
+        return out_path
+
+    def sorted_records(self) -> Iterator[Tuple[int, int, int]]:
+        """Yield (token, t, lane) in token order, merging at most fan_in runs at once."""
+        self._flush()
+        runs = self.runs
+        while len(runs) > self.fan_in:
+            runs = [
+                self._merge_runs(runs[i:i + self.fan_in])
+                for i in range(0, len(runs), self.fan_in)
+            ]
+        self.runs = runs
+        for record in heapq.merge(*(self._read_run(p) for p in runs)):
+            token_raw, t, lane = self.record.unpack(record)
+            yield int.from_bytes(token_raw, "big"), t, lane
+
+
+@dataclass
+class CollisionStats:
+    bits: int
+    tokens: int = 0
+    suspects: int = 0
+    candidates: int = 0
+    same_cycle_pairs: int = 0
+    same_lane_pairs: int = 0
+    cross_pairs: int = 0
+    examples: List[Tuple[int, int, int, int, int]] = field(default_factory=list)
+
+    @property
+    def total_pairs(self) -> int:
+        return self.same_cycle_pairs + self.same_lane_pairs + self.cross_pairs
+
+
+def birthday_expected_pairs(count: int, bits: int) -> float:
+    # ldexp rather than a float of 2^bits, which overflows above 1023 bits.
+    return math.ldexp(count * (count - 1) / 2, -bits)
+
+
+class _GroupCounter:
+    """Pair counts for one run of equal tokens in a single linear pass.
+
+    Records arrive sorted by (t, lane), so equal t are adjacent; same-lane
+    pairs come from a per-lane counter. State is O(x + max_examples) however
+    large the group grows.
+    """
+
+    def __init__(self, stats: CollisionStats, max_examples: int) -> None:
+        self.stats = stats
+        self.max_examples = max_examples
+        self.token: Optional[int] = None
+        self.count = 0
+        self.pairs = 0
+        self.same_cycle = 0
+        self.same_lane = 0
+        self.run_t = -1
+        self.run_len = 0
+        self.lanes: Dict[int, int] = {}
+        self.head: List[Tuple[int, int]] = []
+
+    def start(self, token: int) -> None:
+        self.token = token
+        self.count = self.pairs = self.same_cycle = self.same_lane = 0
+        self.run_t = -1
+        self.run_len = 0
+        self.lanes.clear()
+        self.head = []
+
+    def add(self, t: int, lane: int) -> None:
+        self.pairs += self.count
+        self.count += 1
+        if t == self.run_t:
+            self.same_cycle += self.run_len
+            self.run_len += 1
+        else:
+            self.run_t = t
+            self.run_len = 1
+        seen = self.lanes.get(lane, 0)
+        self.same_lane += seen
+        self.lanes[lane] = seen + 1
+        if len(self.head) <= self.max_examples:
+            self.head.append((t, lane))
+
+    def finish(self) -> None:
+        if self.count < 2:
+            return
+        stats = self.stats
+        # One token per (t, lane), so same-cycle and same-lane pairs are disjoint.
+        stats.same_cycle_pairs += self.same_cycle
+        stats.same_lane_pairs += self.same_lane
+        stats.cross_pairs += self.pairs - self.same_cycle - self.same_lane
+        for i, (t_a, lane_a) in enumerate(self.head):
+            for t_b, lane_b in self.head[i + 1:]:
+                if len(stats.examples) >= self.max_examples:
+                    return
+                stats.examples.append((self.token, t_a, lane_a, t_b, lane_b))
+
+
+def collision_audit(
+    params: Params,
+    secrets: List[ProviderSecrets],
+    cycles: int,
+    audit_bits: Sequence[int],
+    bloom_bytes: int = 1 << 24,
+    buffer_records: int = 1 << 18,
+    max_examples: int = 4,
+    workdir: Optional[str] = None,
+) -> List[CollisionStats]:
+    """Two-pass exact collision count over all lane tokens with bounded memory.
+
+    Pass 1 streams every lane token into a per-size Bloom filter; tokens that
+    hit an already-set filter are recorded in a second, candidate filter.
+    Pass 2 re-derives the stream and spills only candidate tokens to sorted
+    runs, which are merged to confirm collisions exactly.
+    """
+    for bits in audit_bits:
+        if not (1 <= bits <= params.token_bits):
+            raise ValueError(f"audit bits must be between 1 and {params.token_bits}")
+    shifts = [params.token_bits - bits for bits in audit_bits]
+    stats = [CollisionStats(bits=bits) for bits in audit_bits]
+    seen = [BloomFilter(bits, bloom_bytes) for bits in audit_bits]
+    candidates = [BloomFilter(bits, bloom_bytes) for bits in audit_bits]
+
+    for _t, _lane, token in iter_lane_tokens(params, secrets, 0, cycles):
+        for k, shift in enumerate(shifts):
+            short = token >> shift
+            stats[k].tokens += 1
+            if seen[k].add(short):
+                stats[k].suspects += 1
+                candidates[k].add(short)
+
+    active = [k for k, s in enumerate(stats) if s.suspects]
+    if not active:
+        return stats
+
+    with tempfile.TemporaryDirectory(prefix="pcpl-audit-", dir=workdir) as tmp:
+        spillers = {
+            k: RunSpiller(
+                os.path.join(tmp, str(audit_bits[k])),
+                (audit_bits[k] + 7) // 8,
+                buffer_records,
+            )
+            for k in active
+        }
+        for spiller in spillers.values():
+            os.mkdir(spiller.workdir)
+
+        for t, lane, token in iter_lane_tokens(params, secrets, 0, cycles):
+            for k in active:
+                short = token >> shifts[k]
+                if short in candidates[k]:
+                    spillers[k].add(short, t, lane)
+
+        for k, spiller in spillers.items():
+            stats[k].candidates = spiller.spilled + len(spiller.buffer)
+            group = _GroupCounter(stats[k], max_examples)
+            for token, t, lane in spiller.sorted_records():
+                if token != group.token:
+                    group.finish()
+                    group.start(token)
+                group.add(t, lane)
+            group.finish()
+
+    return stats
+
+
+def collision_report(params: Params, cycles: int, stats: Sequence[CollisionStats]) -> None:
+    print("collision-audit: bits | tokens | suspects | candidates | pairs | expected | same_cycle | same_lane | cross")
+    same_cycle_slots = cycles * params.x * (params.x - 1) // 2
+    for s in stats:
+        expected = birthday_expected_pairs(s.tokens, s.bits)
+        expected_same_cycle = math.ldexp(same_cycle_slots, -s.bits)
+        print(
+            f"collision-audit: {s.bits} | {s.tokens} | {s.suspects} | {s.candidates} | "
+            f"{s.total_pairs} | {expected:.3f} | {s.same_cycle_pairs} (exp {expected_same_cycle:.3f}) | "
+            f"{s.same_lane_pairs} | {s.cross_pairs}"
+        )
+        width = (s.bits + 3) // 4
+        for token, t_a, lane_a, t_b, lane_b in s.examples:
+            print(
+                f"collision-audit:   0x{token:0{width}x} t={t_a} lane={lane_a} "
+                f"<-> t={t_b} lane={lane_b}"
+            )
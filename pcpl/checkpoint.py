@@ -0,0 +1,163 @@
+"""
+Compact, atomically written snapshots of DeviceState for long-running
+simulations.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import tempfile
+from typing import List, Optional, Tuple
+
+from .core import DeviceState, Params, int_to_bytes_fixed
+from .hashing import h_bytes
+
+
+CHECKPOINT_MAGIC = b"PCPLCKP1"
+CHECKPOINT_HEADER = struct.Struct(">8sHHHQ32s")
+CHECKPOINT_DIGEST_BYTES = 16
+
+
+def fixture_fingerprint(params: Params, state: DeviceState) -> bytes:
+    """Bind a snapshot to the exact Params, perm_key and provider secrets."""
+    secret_parts = [
+        value
+        for secret in state.secrets
+        for bouquet in (secret.bouquetA, secret.bouquetB, secret.bouquetC)
+        for value in (len(bouquet), *bouquet)
+    ]
+    return h_bytes(
+        params.x, params.P, params.Q, params.R, params.M,
+        params.a0, params.b0, params.c0,
+        params.token_bits, params.seed_bytes, params.perm_mode, params.hash_backend,
+        state.perm_key,
+        *secret_parts,
+        "CHECKPOINT",
+        out_len=32,
+    )
+
+
+def encode_checkpoint(t: int, params: Params, state: DeviceState) -> bytes:
+    body = CHECKPOINT_HEADER.pack(
+        CHECKPOINT_MAGIC,
+        params.x,
+        params.token_bytes,
+        params.seed_bytes,
+        t,
+        fixture_fingerprint(params, state),
+    )
+    body += state.S + b"".join(int_to_bytes_fixed(w, params.token_bytes) for w in state.W)
+    return body + hashlib.blake2b(body, digest_size=CHECKPOINT_DIGEST_BYTES).digest()
+
+
+def decode_checkpoint(data: bytes, params: Params, state: DeviceState) -> int:
+    """Restore W and S into `state` from a snapshot; return its cycle index."""
+    body, digest = data[:-CHECKPOINT_DIGEST_BYTES], data[-CHECKPOINT_DIGEST_BYTES:]
+    if hashlib.blake2b(body, digest_size=CHECKPOINT_DIGEST_BYTES).digest() != digest:
+        raise ValueError("Checkpoint is corrupt (digest mismatch)")
+    if len(body) < CHECKPOINT_HEADER.size:
+        raise ValueError("Checkpoint is truncated")
+    magic, x, token_bytes, seed_bytes, t, fingerprint = CHECKPOINT_HEADER.unpack_from(body)
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError("Not a PCPL checkpoint")
+    if (x, token_bytes, seed_bytes) != (params.x, params.token_bytes, params.seed_bytes):
+        raise ValueError("Checkpoint shape does not match params")
+    if fingerprint != fixture_fingerprint(params, state):
+        raise ValueError("Checkpoint was written for different params or secrets")
+    offset = CHECKPOINT_HEADER.size
+    if len(body) != offset + seed_bytes + x * token_bytes:
+        raise ValueError("Checkpoint is truncated")
+    state.S = body[offset:offset + seed_bytes]
+    offset += seed_bytes
+    state.W = [
+        int.from_bytes(body[offset + i * token_bytes:offset + (i + 1) * token_bytes], "big")
+        for i in range(x)
+    ]
+    return t
+
+
+def checkpoint_path(directory: str, t: int) -> str:
+    return os.path.join(directory, f"pcpl-{t:020d}.ckpt")
+
+
+def list_checkpoints(directory: str) -> List[Tuple[int, str]]:
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    for name in os.listdir(directory):
+        if name.startswith("pcpl-") and name.endswith(".ckpt"):
+            try:
+                found.append((int(name[5:-5]), os.path.join(directory, name)))
+            except ValueError:
+                continue
+    return sorted(found)
+
+
+def _snapshot_fingerprint(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as handle:
+            header = handle.read(CHECKPOINT_HEADER.size)
+    except OSError:
+        return None
+    if len(header) < CHECKPOINT_HEADER.size:
+        return None
+    magic, _x, _token_bytes, _seed_bytes, _t, fingerprint = CHECKPOINT_HEADER.unpack(header)
+    return fingerprint if magic == CHECKPOINT_MAGIC else None
+
+
+def save_checkpoint(directory: str, t: int, params: Params, state: DeviceState, keep: int = 2) -> str:
+    """Atomically write a snapshot (temp file, fsync, rename) and prune old ones.
+
+    Only snapshots of the same fixture at a lower cycle are pruned, keeping the
+    `keep - 1` latest of them next to the new one; snapshots past t (e.g. from
+    a longer earlier run) and those of other fixtures are left alone.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = checkpoint_path(directory, t)
+    fingerprint = fixture_fingerprint(params, state)
+    fd, tmp_path = tempfile.mkstemp(prefix=".pcpl-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(encode_checkpoint(t, params, state))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    older = [
+        old_path
+        for old_t, old_path in list_checkpoints(directory)
+        if old_t < t and _snapshot_fingerprint(old_path) == fingerprint
+    ]
+    for old_path in older[:max(0, len(older) - (max(1, keep) - 1))]:
+        os.remove(old_path)
+    return path
+
+
+def load_latest_checkpoint(
+    directory: str,
+    params: Params,
+    state: DeviceState,
+    max_cycle: Optional[int] = None,
+) -> int:
+    """Restore the newest valid snapshot at or before `max_cycle`; return its cycle (0 if none)."""
+    for t, path in reversed(list_checkpoints(directory)):
+        if max_cycle is not None and t > max_cycle:
+            continue
+        with open(path, "rb") as handle:
+            data = handle.read()
+        try:
+            return decode_checkpoint(data, params, state)
+        except ValueError as exc:
+            print(f"checkpoint: skipping {path}: {exc}")
+    return 0
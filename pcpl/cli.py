@@ -0,0 +1,415 @@
+"""
+Command-line driver for the cycle-by-cycle PCPL simulation.
+Models both roles:
+- Device emitter: selects a lane via perm_key, computes only that lane token,
+  and updates W and S.
+- Provider validators: each lane recomputes its own token every cycle; matches
+  occur 1-of-x by construction.
+Validates the 1-of-x lane property and the per-block permutation schedule, with
+optional dynamic prime generation and difficulty reporting.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from .audit import collision_audit, collision_report
+from .checkpoint import load_latest_checkpoint, save_checkpoint
+from .core import (
+    PERM_MODES,
+    PRIME_POOL,
+    CompoundConfig,
+    DeviceState,
+    Params,
+    ProviderSecrets,
+    build_compound_config,
+    build_fixture,
+    build_params,
+    derive_seed,
+    linear_difficulty_report,
+    permutation_for_block,
+    phase_clock,
+    qft_report,
+    schedule_period,
+)
+from .hashing import HASH_BACKENDS, get_backend
+from .oracle import CycleOracle, parse_cycle_range, validate_sampled
+from .validate import fast_forward, validate_chaining, validate_cycles, validate_permutation
+
+
+def parse_x_list(values: str, minimum: int = 2, label: str = "compare-x") -> List[int]:
+    parts = [part.strip() for part in values.split(",") if part.strip()]
+    if not parts:
+        raise ValueError(f"{label} list is empty")
+    parsed = []
+    for part in parts:
+        value = int(part)
+        if value < minimum:
+            raise ValueError(f"{label} values must be at least {minimum}")
+        parsed.append(value)
+    return parsed
+
+
+def compare_x_modes(args: argparse.Namespace) -> None:
+    x_values = parse_x_list(args.compare_x)
+    print("compare-x: x | period_bits | chain_edges | perm0 | P,Q,R")
+    for x in x_values:
+        param_rng = None
+        if args.prime_mode == "generated":
+            param_rng = random.Random(derive_seed(args.seed, f"PARAMS:{x}", args.hash_backend))
+        params = build_params(
+            x,
+            args.token_bits,
+            prime_mode=args.prime_mode,
+            prime_bits=args.prime_bits,
+            modulus_bits=args.modulus_bits,
+            rng=param_rng,
+            perm_mode=args.perm_mode,
+            hash_backend=args.hash_backend,
+        )
+        compound_cfg = build_compound_config(
+            args.seed,
+            params,
+            args.compound_count,
+            args.compound_primes,
+            args.compound_mode,
+            args.compound_offset,
+            args.compound_prime_bits,
+            args.compound_pool_size,
+            pool_label=f"COMPOUND_POOL:{x}",
+        )
+        _, state = build_fixture(params, args.seed, compound_cfg)
+        phase_block = phase_clock(0, params)
+        perm = permutation_for_block(0, params, state.perm_key, phase_block.phi)
+        period_bits = schedule_period(params).bit_length()
+        print(
+            f"compare-x: {x} | {period_bits} | {x - 1} | {perm} | "
+            f"{params.P},{params.Q},{params.R}"
+        )
+        if args.linear_report:
+            linear_difficulty_report(params, compound_cfg.num_compounds, args.analysis_window)
+        if args.qft_report:
+            qft_report(params)
+
+
+def compare_hash_backends(args: argparse.Namespace) -> None:
+    names = [name.strip() for name in args.compare_hash.split(",") if name.strip()]
+    for name in names:
+        if name not in HASH_BACKENDS:
+            raise ValueError(f"hash backend must be one of {HASH_BACKENDS}")
+    print("compare-hash: backend | cycles/s | hashes/cycle | hashes/s | per-role calls/cycle")
+    seed_backend = args.hash_backend
+    for name in names:
+        args.hash_backend = name
+        # Generated primes and pools come from one fixed backend, so every row
+        # runs the same P/Q/R/M and compounds and differs only in the hash.
+        params, _compound_cfg, secrets, state = build_setup(args, seed_backend=seed_backend)
+        backend = get_backend(name)
+        backend.reset_counts()
+        backend.counting = True
+        try:
+            began = time.perf_counter()
+            validate_cycles(params, secrets, state, args.cycles)
+            elapsed = time.perf_counter() - began
+        finally:
+            backend.counting = False
+        cycles = max(1, args.cycles)
+        roles = " ".join(
+            f"{role}={count / cycles:.2f}" for role, count in sorted(backend.calls.items())
+        )
+        print(
+            f"compare-hash: {name} | {args.cycles / elapsed:.1f} | "
+            f"{backend.total_calls / cycles:.2f} | {backend.total_calls / elapsed:.0f} | {roles}"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="PCPL cycle-by-cycle demo test.")
+    parser.add_argument("--cycles", type=int, default=200, help="Number of cycles to simulate.")
+    parser.add_argument("--x", type=int, default=4, help="Number of providers.")
+    parser.add_argument("--seed", type=int, default=1337, help="Deterministic RNG seed.")
+    parser.add_argument("--token-bits", type=int, default=128, help="Token size in bits.")
+    parser.add_argument(
+        "--prime-mode",
+        choices=("fixed", "generated"),
+        default="fixed",
+        help="Prime selection mode for P/Q/R (and M when generated).",
+    )
+    parser.add_argument("--prime-bits", type=int, default=20, help="Bit size for generated P/Q/R.")
+    parser.add_argument("--modulus-bits", type=int, default=61, help="Bit size for generated modulus M.")
+    parser.add_argument(
+        "--perm-mode",
+        choices=PERM_MODES,
+        default="shuffle",
+        help="Block permutation: per-step Fisher-Yates shuffle, or one-hash Lehmer-code unranking.",
+    )
+    parser.add_argument(
+        "--hash-backend",
+        choices=HASH_BACKENDS,
+        default="blake2b",
+        help="Hash primitive for every protocol role (shake* allow tokens above 512 bits).",
+    )
+    parser.add_argument(
+        "--compare-hash",
+        type=str,
+        default="",
+        help="Comma-separated hash backends to benchmark over --cycles and exit.",
+    )
+    parser.add_argument(
+        "--compound-mode",
+        choices=("classic", "prime-power", "semiprime", "offset", "blend"),
+        default="classic",
+        help="Compound generation mode for bouquets.",
+    )
+    parser.add_argument("--compound-count", type=int, default=4, help="Compounds per bouquet.")
+    parser.add_argument("--compound-primes", type=int, default=3, help="Primes per compound.")
+    parser.add_argument(
+        "--compound-offset",
+        type=int,
+        default=0,
+        help="Offset added to compounds for offset/blend modes.",
+    )
+    parser.add_argument(
+        "--compound-prime-bits",
+        type=int,
+        default=0,
+        help="Bit size for generated prime pool (0 uses built-in pool).",
+    )
+    parser.add_argument(
+        "--compound-pool-size",
+        type=int,
+        default=len(PRIME_POOL),
+        help="Prime pool size when generating compound primes.",
+    )
+    parser.add_argument(
+        "--analysis-window",
+        type=int,
+        default=64,
+        help="Cycles to sample for linear difficulty report.",
+    )
+    parser.add_argument("--linear-report", action="store_true", help="Print pre-hash linear metrics.")
+    parser.add_argument("--qft-report", action="store_true", help="Print QFT-visible period metrics.")
+    parser.add_argument(
+        "--compare-x",
+        type=str,
+        default="",
+        help="Comma-separated x values to compare and exit.",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=0,
+        help="Validate N randomly chosen cycles and blocks from --range instead of running sequentially.",
+    )
+    parser.add_argument(
+        "--range",
+        type=str,
+        default="",
+        help="LO:HI cycle range for --sample (e.g. 0:2^60); defaults to one schedule period.",
+    )
+    parser.add_argument(
+        "--collision-audit",
+        type=str,
+        default="",
+        help="Comma-separated token sizes (bits) to audit for cross-lane/cross-cycle collisions and exit.",
+    )
+    parser.add_argument(
+        "--audit-bloom-mb",
+        type=int,
+        default=16,
+        help="Bloom filter size per audited token size, in MiB.",
+    )
+    parser.add_argument(
+        "--audit-run-records",
+        type=int,
+        default=1 << 18,
+        help="Records buffered in memory before spilling a sorted run to disk.",
+    )
+    parser.add_argument("--audit-dir", type=str, default=None, help="Directory for audit spill files.")
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        default="",
+        help="Directory for periodic device-state snapshots.",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=10000,
+        help="Cycles between snapshots when --checkpoint-dir is set.",
+    )
+    parser.add_argument("--checkpoint-keep", type=int, default=2, help="Snapshots to retain.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the latest snapshot in --checkpoint-dir.",
+    )
+    parser.add_argument(
+        "--start-cycle",
+        type=int,
+        default=None,
+        help="Start validation at this cycle, fast-forwarding from the nearest earlier snapshot.",
+    )
+    parser.add_argument("--show-params", action="store_true", help="Print P, Q, R, M values.")
+    parser.add_argument("--verbose", action="store_true", help="Print first few cycles.")
+    parser.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="Record validation anomalies and report them at the end instead of stopping at the first.",
+    )
+    parser.add_argument("--max-anomalies", type=int, default=16, help="Anomalies kept with --keep-going.")
+    parser.add_argument("--no-chaining-check", action="store_true", help="Skip chaining divergence check.")
+    return parser
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    return build_parser().parse_args(argv)
+
+
+def build_setup(
+    args: argparse.Namespace,
+    seed_backend: Optional[str] = None,
+) -> Tuple[Params, CompoundConfig, List[ProviderSecrets], DeviceState]:
+    """Derive params, compound config and a fresh fixture from CLI-style options.
+
+    Generated primes and pools are seeded through `seed_backend` (default:
+    --hash-backend).
+    """
+    seed_backend = seed_backend or args.hash_backend
+    param_rng = None
+    if args.prime_mode == "generated":
+        param_rng = random.Random(derive_seed(args.seed, "PARAMS", seed_backend))
+    params = build_params(
+        args.x,
+        args.token_bits,
+        prime_mode=args.prime_mode,
+        prime_bits=args.prime_bits,
+        modulus_bits=args.modulus_bits,
+        rng=param_rng,
+        perm_mode=args.perm_mode,
+        hash_backend=args.hash_backend,
+    )
+    compound_cfg = build_compound_config(
+        args.seed,
+        params,
+        args.compound_count,
+        args.compound_primes,
+        args.compound_mode,
+        args.compound_offset,
+        args.compound_prime_bits,
+        args.compound_pool_size,
+        pool_label="COMPOUND_POOL",
+        seed_backend=seed_backend,
+    )
+    secrets, state = build_fixture(params, args.seed, compound_cfg)
+    return params, compound_cfg, secrets, state
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.compare_x:
+        compare_x_modes(args)
+        return
+    if args.compare_hash:
+        compare_hash_backends(args)
+        return
+
+    params, compound_cfg, secrets, state = build_setup(args)
+
+    if args.sample:
+        lo, hi = parse_cycle_range(args.range) if args.range else (0, schedule_period(params))
+        oracle = CycleOracle(params, state.perm_key, secrets)
+        rng = random.Random(derive_seed(args.seed, "SAMPLE"))
+        summary = validate_sampled(oracle, args.sample, lo, hi, rng)
+        print(
+            f"OK: sampled cycles={summary.cycles} blocks={summary.blocks} replayed={summary.replayed} "
+            f"range={lo}:{hi} (~2^{hi.bit_length() - 1}) providers={params.x}"
+        )
+        return
+
+    if args.collision_audit:
+        stats = collision_audit(
+            params,
+            secrets,
+            args.cycles,
+            parse_x_list(args.collision_audit, minimum=1, label="collision-audit"),
+            bloom_bytes=args.audit_bloom_mb << 20,
+            buffer_records=args.audit_run_records,
+            workdir=args.audit_dir,
+        )
+        collision_report(params, args.cycles, stats)
+        return
+
+    start = 0
+    if args.resume or args.start_cycle is not None:
+        if args.resume and not args.checkpoint_dir:
+            raise ValueError("--resume requires --checkpoint-dir")
+        if args.start_cycle is not None and not 0 <= args.start_cycle <= args.cycles:
+            raise ValueError("start-cycle must be between 0 and cycles")
+        snapshot = 0
+        if args.checkpoint_dir:
+            max_cycle = args.start_cycle if args.start_cycle is not None else args.cycles
+            snapshot = load_latest_checkpoint(args.checkpoint_dir, params, state, max_cycle=max_cycle)
+        start = snapshot if args.start_cycle is None else args.start_cycle
+        if start < snapshot or start > args.cycles:
+            raise ValueError(f"snapshot at cycle {snapshot} is past cycles={args.cycles}")
+        fast_forward(params, state, snapshot, start)
+        print(f"resume: snapshot={snapshot} start={start}")
+
+    checkpoint = None
+    if args.checkpoint_dir:
+        if args.checkpoint_every <= 0:
+            raise ValueError("checkpoint-every must be positive")
+
+        def checkpoint(t: int, device_state: DeviceState) -> None:
+            if t % args.checkpoint_every == 0 or t == args.cycles:
+                save_checkpoint(args.checkpoint_dir, t, params, device_state, keep=args.checkpoint_keep)
+
+    start_block = start // params.x
+    validate_permutation(
+        params,
+        state.perm_key,
+        blocks=max(1, args.cycles // params.x - start_block),
+        start_block=start_block,
+    )
+    validate_cycles(
+        params,
+        secrets,
+        state,
+        args.cycles,
+        verbose=args.verbose,
+        start=start,
+        checkpoint=checkpoint,
+        fail_fast=not args.keep_going,
+        max_anomalies=args.max_anomalies,
+    )
+    if not args.no_chaining_check:
+        validate_chaining(params, args.seed, compound_cfg)
+
+    if args.show_params:
+        print(f"params: P={params.P} Q={params.Q} R={params.R} M={params.M}")
+    if args.linear_report:
+        linear_difficulty_report(
+            params,
+            compound_cfg.num_compounds,
+            min(args.analysis_window, args.cycles),
+        )
+    if args.qft_report:
+        qft_report(params)
+
+    blocks = args.cycles // params.x
+    print(
+        "OK: cycles={cycles} providers={providers} blocks={blocks} token_bits={bits}".format(
+            cycles=args.cycles,
+            providers=params.x,
+            blocks=blocks,
+            bits=params.token_bits,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,724 @@
+"""
+Core PCPL primitives: parameters, phase clock, permutation schedule, bouquet
+evaluation, lane tokens and the device/provider cycle functions.
+"""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import math
+import random
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .hashing import HashBackend, get_backend
+
+
+PRIME_POOL = [
+    3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67
+]
+MR_BASES_64 = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+# Shared phase cache: Phase records kept per clock (oldest evicted first), cycles
+# computed ahead when a clock is read sequentially, and distinct Params kept.
+PHASE_CACHE_SIZE = 4096
+PHASE_READAHEAD = 64
+PHASE_CLOCKS_MAX = 8
+
+PERM_MODES = ("shuffle", "lehmer")
+LEHMER_TABLE_MAX_X = 7
+
+
+@functools.lru_cache(maxsize=None)
+def perm_table(x: int) -> List[Tuple[int, ...]]:
+    """All permutations of range(x) in lexicographic (Lehmer rank) order."""
+    return [tuple(p) for p in itertools.permutations(range(x))]
+
+
+def __getattr__(name: str) -> object:
+    # PERM_TABLE_24 is built on first use rather than at import time.
+    if name == "PERM_TABLE_24":
+        return perm_table(4)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@dataclass(frozen=True)
+class Params:
+    x: int
+    P: int
+    Q: int
+    R: int
+    M: int
+    a0: int
+    b0: int
+    c0: int
+    token_bits: int
+    token_bytes: int
+    seed_bytes: int
+    mod_bytes: int
+    perm_mode: str = "shuffle"
+    hash_backend: str = "blake2b"
+
+
+@dataclass(frozen=True)
+class Phase:
+    a: int
+    b: int
+    c: int
+    u1: int
+    u2: int
+    u3: int
+    phi: bytes
+
+
+@dataclass(frozen=True)
+class ProviderSecrets:
+    bouquetA: List[int]
+    bouquetB: List[int]
+    bouquetC: List[int]
+
+
+@dataclass(frozen=True)
+class CompoundConfig:
+    num_compounds: int
+    primes_per_compound: int
+    mode: str
+    offset_max: int
+    exponent_min: int
+    exponent_max: int
+    prime_pool: Sequence[int]
+
+
+@dataclass
+class DeviceState:
+    W: List[int]
+    S: bytes
+    perm_key: bytes
+    secrets: List[ProviderSecrets]
+
+
+def int_to_bytes_fixed(value: int, length: int) -> bytes:
+    return value.to_bytes(length, "big")
+
+
+def trunc_bits(data: bytes, bits: int) -> int:
+    byte_len = (bits + 7) // 8
+    value = int.from_bytes(data[:byte_len], "big")
+    extra = (byte_len * 8) - bits
+    if extra:
+        value >>= extra
+    return value
+
+
+def derive_seed(seed: int, label: str, hash_backend: str = "blake2b") -> int:
+    return int.from_bytes(get_backend(hash_backend).h(seed, label, out_len=8), "big")
+
+
+def backend_for(params: Params) -> HashBackend:
+    return get_backend(params.hash_backend)
+
+
+def is_prime_small(n: int) -> bool:
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    limit = int(math.isqrt(n))
+    for p in range(3, limit + 1, 2):
+        if n % p == 0:
+            return False
+    return True
+
+
+def is_probable_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    small_primes = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+    for p in small_primes:
+        if n % p == 0:
+            return n == p
+
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in MR_BASES_64:
+        if a % n == 0:
+            continue
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def generate_prime(
+    rng: random.Random,
+    bits: int,
+    avoid_gcd: int,
+    avoid_set: Optional[Set[int]] = None,
+) -> int:
+    if bits < 2:
+        raise ValueError("bits must be >= 2")
+    if avoid_set is None:
+        avoid_set = set()
+    while True:
+        candidate = rng.getrandbits(bits)
+        candidate |= (1 << (bits - 1)) | 1
+        if math.gcd(candidate, avoid_gcd) != 1:
+            continue
+        if candidate in avoid_set:
+            continue
+        if is_probable_prime(candidate):
+            return candidate
+
+
+def generate_prime_pool(
+    rng: random.Random,
+    pool_size: int,
+    bits: int,
+    avoid_set: Optional[Set[int]] = None,
+) -> List[int]:
+    if pool_size <= 0:
+        raise ValueError("pool_size must be positive")
+    if avoid_set is None:
+        avoid_set = set()
+    pool: List[int] = []
+    while len(pool) < pool_size:
+        prime = generate_prime(rng, bits, avoid_gcd=1, avoid_set=avoid_set | set(pool))
+        pool.append(prime)
+    return pool
+
+
+def generate_coprime_primes(
+    rng: random.Random,
+    x: int,
+    bits: int,
+) -> Tuple[int, int, int]:
+    primes = []
+    while len(primes) < 3:
+        prime = generate_prime(rng, bits, avoid_gcd=x, avoid_set=set(primes))
+        primes.append(prime)
+    return primes[0], primes[1], primes[2]
+
+
+def next_prime_avoiding(start: int, avoid: int) -> int:
+    candidate = start
+    while True:
+        if is_prime_small(candidate) and math.gcd(candidate, avoid) == 1:
+            return candidate
+        candidate += 1
+
+
+def build_params(
+    x: int,
+    token_bits: int,
+    seed_bytes: int = 32,
+    prime_mode: str = "fixed",
+    prime_bits: int = 20,
+    modulus_bits: int = 61,
+    rng: Optional[random.Random] = None,
+    perm_mode: str = "shuffle",
+    hash_backend: str = "blake2b",
+) -> Params:
+    if x < 2:
+        raise ValueError("x must be at least 2")
+    if perm_mode not in PERM_MODES:
+        raise ValueError(f"perm_mode must be one of {PERM_MODES}")
+    max_out_len = get_backend(hash_backend).max_out_len
+    if perm_mode == "lehmer" and max_out_len is not None and lehmer_rank_bytes(x) > max_out_len:
+        raise ValueError(f"x! does not fit in one {hash_backend} output; use perm_mode='shuffle'")
+    if token_bits <= 0:
+        raise ValueError("token_bits must be positive")
+    token_bytes = (token_bits + 7) // 8
+    if max_out_len is not None and max(token_bytes, seed_bytes) > max_out_len:
+        raise ValueError(f"token_bits/seed_bytes too large for {hash_backend} (max {max_out_len} bytes)")
+
+    if prime_mode == "fixed":
+        P = next_prime_avoiding(1_000_003, x)
+        Q = next_prime_avoiding(1_000_033, x)
+        R = next_prime_avoiding(1_000_037, x)
+        M = (1 << 61) - 1  # 2^61 - 1, known prime
+    elif prime_mode == "generated":
+        if rng is None:
+            raise ValueError("rng is required when prime_mode='generated'")
+        if prime_bits < 8:
+            raise ValueError("prime_bits too small for generated primes")
+        if modulus_bits < 16:
+            raise ValueError("modulus_bits too small for generated modulus")
+        P, Q, R = generate_coprime_primes(rng, x, prime_bits)
+        M = generate_prime(rng, modulus_bits, avoid_gcd=x, avoid_set={P, Q, R})
+    else:
+        raise ValueError("prime_mode must be 'fixed' or 'generated'")
+    mod_bytes = (M.bit_length() + 7) // 8
+
+    if len({P, Q, R}) != 3:
+        raise ValueError("P, Q, R must be distinct primes")
+    if math.gcd(M, x) != 1:
+        raise ValueError("M must be coprime with x")
+
+    return Params(
+        x=x,
+        P=P,
+        Q=Q,
+        R=R,
+        M=M,
+        a0=1,
+        b0=2,
+        c0=3,
+        token_bits=token_bits,
+        token_bytes=token_bytes,
+        seed_bytes=seed_bytes,
+        mod_bytes=mod_bytes,
+        perm_mode=perm_mode,
+        hash_backend=hash_backend,
+    )
+
+
+def _phase_from_residues(a: int, b: int, c: int, params: Params, h) -> Phase:
+    u1 = (a * b) % params.M
+    u2 = (b * c) % params.M
+    u3 = (c * a) % params.M
+
+    phi = h(a, b, c, u1, u2, u3, "PHASE", out_len=32)
+    return Phase(a=a, b=b, c=c, u1=u1, u2=u2, u3=u3, phi=phi)
+
+
+def _residue_steps(start: int, count: int, params: Params) -> Iterator[Tuple[int, int, int]]:
+    """(a, b, c) for cycles [start, start + count).
+
+    a, b and c are arithmetic progressions mod P, Q and R, so they are reduced
+    once at `start` and then stepped by one with a wrap instead of re-reduced.
+    """
+    a = (params.a0 + start) % params.P
+    b = (params.b0 + start) % params.Q
+    c = (params.c0 + start) % params.R
+    for _ in range(count):
+        yield a, b, c
+        a = a + 1 if a + 1 < params.P else 0
+        b = b + 1 if b + 1 < params.Q else 0
+        c = c + 1 if c + 1 < params.R else 0
+
+
+def phase_range(start: int, count: int, params: Params) -> List[Phase]:
+    """Phases for cycles [start, start + count)."""
+    h = backend_for(params).h
+    return [_phase_from_residues(a, b, c, params, h) for a, b, c in _residue_steps(start, count, params)]
+
+
+class PhaseClock:
+    """Bounded cache of Phase records for one Params.
+
+    A miss that continues a sequential read (at the end of the last filled
+    range, or right after a cached cycle) fills the next `readahead` cycles,
+    hashing only those not cached yet. Other misses compute one cycle and leave
+    the frontier alone, so random or strided access neither pays for phases it
+    never reads nor disturbs a sequential reader.
+    """
+
+    def __init__(self, params: Params, capacity: int = PHASE_CACHE_SIZE, readahead: int = PHASE_READAHEAD) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.params = params
+        self.capacity = capacity
+        self.readahead = max(1, min(readahead, capacity // 2))
+        self.cache: Dict[int, Phase] = {}
+        self.frontier = -1
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def _evict(self) -> None:
+        cache = self.cache
+        while len(cache) > self.capacity:
+            del cache[next(iter(cache))]
+
+    def _fill(self, start: int, count: int) -> None:
+        cache = self.cache
+        h = backend_for(self.params).h
+        for t, (a, b, c) in enumerate(_residue_steps(start, count, self.params), start):
+            if t not in cache:
+                cache[t] = _phase_from_residues(a, b, c, self.params, h)
+        self._evict()
+        self.frontier = start + count
+
+    def phase(self, t: int) -> Phase:
+        with self.lock:
+            cache = self.cache
+            phase = cache.get(t)
+            if phase is not None:
+                self.hits += 1
+                return phase
+            self.misses += 1
+            if t == self.frontier or t - 1 in cache:
+                self._fill(t, self.readahead)
+                return cache[t]
+            phase = cache[t] = phase_range(t, 1, self.params)[0]
+            self._evict()
+            return phase
+
+    def precompute(self, start: int, count: int) -> None:
+        """Fill cycles [start, start + count) that are not cached yet."""
+        with self.lock:
+            self._fill(start, min(count, self.capacity))
+
+
+_phase_clocks: Dict[Params, PhaseClock] = {}
+_phase_clocks_lock = threading.Lock()
+
+
+def shared_phase_clock(params: Params) -> PhaseClock:
+    """The PhaseClock every consumer of `params` shares in this process."""
+    clock = _phase_clocks.get(params)
+    if clock is None:
+        with _phase_clocks_lock:
+            clock = _phase_clocks.get(params)
+            if clock is None:
+                while len(_phase_clocks) >= PHASE_CLOCKS_MAX:
+                    del _phase_clocks[next(iter(_phase_clocks))]
+                clock = _phase_clocks[params] = PhaseClock(params)
+    return clock
+
+
+def phase_clock(t: int, params: Params) -> Phase:
+    return shared_phase_clock(params).phase(t)
+
+
+def lehmer_rank_bytes(x: int) -> int:
+    return (math.factorial(x).bit_length() + 7) // 8
+
+
+def lehmer_unrank(rank: int, x: int) -> Sequence[int]:
+    """Map rank in [0, x!) to its permutation via the factorial number system."""
+    if x <= LEHMER_TABLE_MAX_X:
+        return perm_table(x)[rank]
+    remaining = list(range(x))
+    perm = []
+    for k in range(x - 1, -1, -1):
+        digit, rank = divmod(rank, math.factorial(k))
+        perm.append(remaining.pop(digit))
+    return perm
+
+
+def lehmer_permutation(B: int, params: Params, perm_key: bytes, phi_block: bytes) -> Sequence[int]:
+    """Uniform permutation from one wide hash; rejection keeps the rank unbiased."""
+    total = math.factorial(params.x)
+    out_len = lehmer_rank_bytes(params.x)
+    limit = ((1 << (8 * out_len)) // total) * total
+    h = backend_for(params).h
+    attempt = 0
+    while True:
+        value = int.from_bytes(h(perm_key, B, phi_block, attempt, "PERMLEHMER", out_len=out_len), "big")
+        if value < limit:
+            return lehmer_unrank(value % total, params.x)
+        attempt += 1
+
+
+def permutation_for_block(B: int, params: Params, perm_key: bytes, phi_block: bytes) -> Sequence[int]:
+    if params.perm_mode == "lehmer":
+        return lehmer_permutation(B, params, perm_key, phi_block)
+
+    h = backend_for(params).h
+    if params.x == 4:
+        perm_id = int.from_bytes(h(perm_key, B, phi_block, "PERM", out_len=4), "big") % 24
+        return perm_table(4)[perm_id]
+
+    perm = list(range(params.x))
+    seed = h(perm_key, B, phi_block, "PERMSEED", out_len=32)
+    for k in range(params.x - 1, 0, -1):
+        r = int.from_bytes(h(seed, k, "R", out_len=8), "big") % (k + 1)
+        perm[k], perm[r] = perm[r], perm[k]
+    return perm
+
+
+def device_destination_provider(t: int, params: Params, perm_key: bytes) -> int:
+    block = t // params.x
+    slot = t % params.x
+    phase_block = phase_clock(block * params.x, params)
+    perm = permutation_for_block(block, params, perm_key, phase_block.phi)
+    return perm[slot]
+
+
+def eval_bouquet(bouquet: Sequence[int], xres: int, u: int, params: Params) -> int:
+    h = backend_for(params).h
+    acc = 1 % params.M
+    for j, compound in enumerate(bouquet):
+        base = compound % params.M
+        if base == 0:
+            raise ValueError("Compound is divisible by M; choose different primes")
+        exponent = int.from_bytes(h(xres, u, j, "EXP", out_len=32), "big") % (params.M - 1)
+        acc = (acc * pow(base, exponent, params.M)) % params.M
+    return acc
+
+
+def exponent_vector(num_compounds: int, xres: int, u: int, params: Params) -> List[int]:
+    h = backend_for(params).h
+    return [
+        int.from_bytes(h(xres, u, j, "EXP", out_len=32), "big") % (params.M - 1)
+        for j in range(num_compounds)
+    ]
+
+
+def modinv(value: int, mod: int) -> int:
+    if mod == 2:
+        return 1
+    return pow(value, mod - 2, mod)
+
+
+def rank_mod(matrix: List[List[int]], mod: int) -> int:
+    if not matrix:
+        return 0
+    rows = [row[:] for row in matrix]
+    row_count = len(rows)
+    col_count = len(rows[0])
+    rank = 0
+    for col in range(col_count):
+        pivot = None
+        for r in range(rank, row_count):
+            if rows[r][col] % mod != 0:
+                pivot = r
+                break
+        if pivot is None:
+            continue
+        rows[rank], rows[pivot] = rows[pivot], rows[rank]
+        inv = modinv(rows[rank][col] % mod, mod)
+        for c in range(col, col_count):
+            rows[rank][c] = (rows[rank][c] * inv) % mod
+        for r in range(row_count):
+            if r == rank or rows[r][col] % mod == 0:
+                continue
+            factor = rows[r][col] % mod
+            for c in range(col, col_count):
+                rows[r][c] = (rows[r][c] - factor * rows[rank][c]) % mod
+        rank += 1
+        if rank == col_count:
+            break
+    return rank
+
+
+def linear_difficulty_report(params: Params, num_compounds: int, window: int) -> None:
+    window = max(1, window)
+    matrices = {"A": [], "B": [], "C": []}
+    for t in range(window):
+        phase = phase_clock(t, params)
+        matrices["A"].append(exponent_vector(num_compounds, phase.a, phase.u1, params))
+        matrices["B"].append(exponent_vector(num_compounds, phase.b, phase.u2, params))
+        matrices["C"].append(exponent_vector(num_compounds, phase.c, phase.u3, params))
+
+    for label in ("A", "B", "C"):
+        rows = matrices[label]
+        unique_rows = len({tuple(row) for row in rows})
+        rank_mod2 = rank_mod(rows, 2)
+        rank_modp = rank_mod(rows, 65537)
+        print(
+            f"linear-{label}: unique={unique_rows}/{window} "
+            f"rank_mod2={rank_mod2}/{num_compounds} "
+            f"rank_mod65537={rank_modp}/{num_compounds}"
+        )
+
+
+def lcm(a: int, b: int) -> int:
+    return a // math.gcd(a, b) * b
+
+
+def schedule_period(params: Params) -> int:
+    return lcm(lcm(lcm(params.P, params.Q), params.R), params.x)
+
+
+def qft_report(params: Params) -> None:
+    period = schedule_period(params)
+    print(f"qft-period: {period} (~{period.bit_length()} bits)")
+
+
+def lane_token(lane_idx: int, t: int, phase: Phase, params: Params, secrets: ProviderSecrets) -> int:
+    """Shared per-cycle token derivation used by device and provider circuits."""
+    ea = eval_bouquet(secrets.bouquetA, phase.a, phase.u1, params)
+    eb = eval_bouquet(secrets.bouquetB, phase.b, phase.u2, params)
+    ec = eval_bouquet(secrets.bouquetC, phase.c, phase.u3, params)
+    return lane_token_from_values(lane_idx, t, phase, params, ea, eb, ec)
+
+
+def lane_token_from_values(lane_idx: int, t: int, phase: Phase, params: Params, ea: int, eb: int, ec: int) -> int:
+    """KDF/TOK stage of lane_token from already evaluated bouquets."""
+    h = backend_for(params).h
+    kdf = h(lane_idx, ea, eb, ec, phase.phi, "KDF", out_len=32)
+    tok_hash = h(kdf, t, phase.phi, "TOK", out_len=max(32, params.token_bytes))
+    return trunc_bits(tok_hash, params.token_bits)
+
+
+def provider_cycle(
+    t: int,
+    lane_idx: int,
+    params: Params,
+    secrets: ProviderSecrets,
+    phase: Optional[Phase] = None,
+) -> int:
+    """Provider-side per-cycle recomputation of the expected lane token."""
+    if phase is None:
+        phase = phase_clock(t, params)
+    return lane_token(lane_idx, t, phase, params, secrets)
+
+
+def device_route_token(
+    t: int,
+    params: Params,
+    perm_key: bytes,
+    secrets: Sequence[ProviderSecrets],
+) -> Tuple[int, int, bytes]:
+    """The part of a device cycle that depends only on t: (idx, token, phi)."""
+    phase = phase_clock(t, params)
+
+    idx = device_destination_provider(t, params, perm_key)
+
+    return idx, lane_token(idx, t, phase, params, secrets[idx]), phase.phi
+
+
+def device_evolve(params: Params, state: DeviceState, idx: int, token: int, phi: bytes) -> None:
+    """The sequential part of a device cycle: store the lane token and evolve S."""
+    state.W[idx] = token
+    state.S = evolve_seed(params, state.S, state.W, phi)
+
+
+def evolve_seed(params: Params, S: bytes, W: Sequence[int], phi: bytes) -> bytes:
+    """EVOLVE hash over the seed, all lane states and adjacent chain products."""
+    chain_products = [
+        (W[i] * W[i + 1]) % params.M for i in range(params.x - 1)
+    ]
+    return backend_for(params).h(
+        S,
+        *[int_to_bytes_fixed(w, params.token_bytes) for w in W],
+        *[int_to_bytes_fixed(m, params.mod_bytes) for m in chain_products],
+        phi,
+        "EVOLVE",
+        out_len=params.seed_bytes,
+    )
+
+
+def device_cycle(t: int, params: Params, state: DeviceState) -> Tuple[int, int]:
+    idx, token, phi = device_route_token(t, params, state.perm_key, state.secrets)
+    device_evolve(params, state, idx, token, phi)
+    return idx, token
+
+
+def generate_provider_secrets(rng: random.Random, compound_cfg: CompoundConfig) -> ProviderSecrets:
+    def classic_compound() -> int:
+        value = 1
+        for _ in range(compound_cfg.primes_per_compound):
+            prime = rng.choice(compound_cfg.prime_pool)
+            exponent = rng.randint(compound_cfg.exponent_min, compound_cfg.exponent_max)
+            value *= prime**exponent
+        return value
+
+    def prime_power_compound() -> int:
+        prime = rng.choice(compound_cfg.prime_pool)
+        exponent = rng.randint(max(2, compound_cfg.exponent_min), compound_cfg.exponent_max)
+        return prime**exponent
+
+    def semiprime_compound() -> int:
+        prime_a = rng.choice(compound_cfg.prime_pool)
+        prime_b = rng.choice(compound_cfg.prime_pool)
+        return prime_a * prime_b
+
+    def offset_compound() -> int:
+        base = classic_compound()
+        if compound_cfg.offset_max > 0:
+            base += rng.randint(1, compound_cfg.offset_max)
+        return base
+
+    def make_compound() -> int:
+        mode = compound_cfg.mode
+        if mode == "classic":
+            return classic_compound()
+        if mode == "prime-power":
+            return prime_power_compound()
+        if mode == "semiprime":
+            return semiprime_compound()
+        if mode == "offset":
+            return offset_compound()
+        if mode == "blend":
+            roll = rng.random()
+            if roll < 0.5:
+                return classic_compound()
+            if roll < 0.7:
+                return prime_power_compound()
+            if roll < 0.85:
+                return semiprime_compound()
+            return offset_compound()
+        raise ValueError(f"Unknown compound mode: {mode}")
+
+    return ProviderSecrets(
+        bouquetA=[make_compound() for _ in range(compound_cfg.num_compounds)],
+        bouquetB=[make_compound() for _ in range(compound_cfg.num_compounds)],
+        bouquetC=[make_compound() for _ in range(compound_cfg.num_compounds)],
+    )
+
+
+def build_fixture(
+    params: Params,
+    seed: int,
+    compound_cfg: CompoundConfig,
+) -> Tuple[List[ProviderSecrets], DeviceState]:
+    rng = random.Random(seed)
+    secrets = [
+        generate_provider_secrets(rng, compound_cfg) for _ in range(params.x)
+    ]
+
+    seed_material = rng.getrandbits(256).to_bytes(32, "big")
+    h = backend_for(params).h
+    perm_key = h(seed_material, "PERMKEY", out_len=32)
+    seed_state = h(seed_material, "SEED", out_len=params.seed_bytes)
+    token_hash_len = max(32, params.token_bytes)
+    w_init = [
+        trunc_bits(h(seed_material, "W", i, out_len=token_hash_len), params.token_bits)
+        for i in range(params.x)
+    ]
+
+    state = DeviceState(W=w_init, S=seed_state, perm_key=perm_key, secrets=secrets)
+    return secrets, state
+
+
+def build_compound_config(
+    seed: int,
+    params: Params,
+    num_compounds: int,
+    primes_per_compound: int,
+    compound_mode: str,
+    compound_offset: int,
+    compound_prime_bits: int,
+    compound_pool_size: int,
+    pool_label: str,
+    seed_backend: Optional[str] = None,
+) -> CompoundConfig:
+    """Compound generator settings; a generated pool is seeded through
+    `seed_backend` (default: the params' backend)."""
+    if compound_prime_bits > 0:
+        rng_pool = random.Random(derive_seed(seed, pool_label, seed_backend or params.hash_backend))
+        prime_pool = generate_prime_pool(
+            rng_pool,
+            compound_pool_size,
+            compound_prime_bits,
+            avoid_set={params.M},
+        )
+    else:
+        prime_pool = PRIME_POOL
+    if not prime_pool:
+        raise ValueError("Prime pool cannot be empty")
+    return CompoundConfig(
+        num_compounds=num_compounds,
+        primes_per_compound=primes_per_compound,
+        mode=compound_mode,
+        offset_max=max(0, compound_offset),
+        exponent_min=1,
+        exponent_max=3,
+        prime_pool=prime_pool,
+    )
@@ -0,0 +1,165 @@
+"""
+Real-time paced device emitter.
+
+Wall-clock time is mapped to cycles at a fixed cadence: cycle t is due at
+t0 + t / rate and must be emitted before t0 + (t + 1) / rate. An asyncio task
+sleeps until each slot, runs device_cycle and records scheduling jitter (wake
+time minus slot start), compute time and whether the deadline was missed. A
+late device still emits every cycle in order; it never skips t. With
+--prefetch-workers the slot work is only the EVOLVE step of a PipelinedDevice.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional, Sequence
+
+from .cli import build_parser, build_setup
+from .core import DeviceState, Params, device_cycle
+from .pipeline import PipelinedDevice
+
+# Below this much remaining time the emitter spins on the event loop instead of
+# asking for a timer, whose resolution is too coarse for kHz cadences.
+SPIN_THRESHOLD = 0.002
+
+TokenSink = Callable[[int, int, int], Awaitable[None]]
+
+
+@dataclass
+class PacingStats:
+    rate: float
+    cycles: int = 0
+    missed: int = 0
+    elapsed: float = 0.0
+    jitter: List[float] = field(default_factory=list)
+    compute: List[float] = field(default_factory=list)
+    # Jitter of slots the device reached idle, i.e. pure scheduler overhead.
+    wake_overhead: List[float] = field(default_factory=list)
+
+    def percentile(self, values: List[float], q: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    @property
+    def max_sustainable_rate(self) -> float:
+        """Cadence at which p99 wake overhead plus p99 compute still fits in one slot."""
+        budget = self.percentile(self.compute, 0.99) + self.percentile(self.wake_overhead, 0.99)
+        return 1.0 / budget if budget > 0 else float("inf")
+
+
+async def _sleep_until(loop: asyncio.AbstractEventLoop, when: float) -> float:
+    while True:
+        remaining = when - loop.time()
+        if remaining <= 0:
+            return loop.time()
+        if remaining > SPIN_THRESHOLD:
+            await asyncio.sleep(remaining - SPIN_THRESHOLD)
+        else:
+            await asyncio.sleep(0)
+
+
+async def run_paced(
+    params: Params,
+    state: DeviceState,
+    rate: float,
+    cycles: int,
+    start: int = 0,
+    sink: Optional[TokenSink] = None,
+    device: Optional[PipelinedDevice] = None,
+) -> PacingStats:
+    """Emit cycles [start, start + cycles) at `rate` Hz and measure pacing.
+
+    When `device` is given it must be positioned at `start` over `state`, and
+    cycles are emitted from its prefetched tokens.
+    """
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    loop = asyncio.get_running_loop()
+    period = 1.0 / rate
+    stats = PacingStats(rate=rate)
+    t0 = loop.time() + period
+    finished = t0
+    for k in range(cycles):
+        t = start + k
+        slot_start = t0 + k * period
+        woke = await _sleep_until(loop, slot_start)
+        stats.jitter.append(woke - slot_start)
+        if finished <= slot_start:
+            stats.wake_overhead.append(woke - slot_start)
+        tick = time.perf_counter()
+        if device is not None:
+            idx, token = device.step()
+        else:
+            idx, token = device_cycle(t, params, state)
+        stats.compute.append(time.perf_counter() - tick)
+        finished = loop.time()
+        if finished > slot_start + period:
+            stats.missed += 1
+        if sink is not None:
+            await sink(t, idx, token)
+        stats.cycles += 1
+    stats.elapsed = loop.time() - t0
+    return stats
+
+
+def pacing_report(stats: PacingStats) -> None:
+    ms = 1e3
+    print(
+        f"pace: {stats.rate:g} | {stats.cycles} | {stats.missed} ({stats.missed / max(1, stats.cycles) * 100:.1f}%) | "
+        f"{stats.percentile(stats.jitter, 0.5) * ms:.3f}/{stats.percentile(stats.jitter, 0.99) * ms:.3f}/"
+        f"{max(stats.jitter, default=0.0) * ms:.3f} | "
+        f"{stats.percentile(stats.compute, 0.5) * ms:.3f}/{stats.percentile(stats.compute, 0.99) * ms:.3f}/"
+        f"{max(stats.compute, default=0.0) * ms:.3f} | "
+        f"{stats.percentile(stats.compute, 0.5) * stats.rate * 100:.0f}% | {stats.max_sustainable_rate:.0f}"
+    )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = build_parser()
+    parser.description = "PCPL real-time paced emitter."
+    parser.add_argument(
+        "--rate",
+        type=str,
+        default="100",
+        help="Comma-separated cadences in Hz (e.g. 100,1000,10000); --cycles cycles each.",
+    )
+    parser.add_argument(
+        "--prefetch-workers",
+        type=int,
+        default=0,
+        help="Prefetch routed tokens in this many processes (0 computes them in the slot).",
+    )
+    parser.add_argument("--prefetch-depth", type=int, default=8, help="Prefetch chunks in flight or buffered.")
+    parser.add_argument("--prefetch-chunk", type=int, default=64, help="Cycles per prefetch task.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    rates = [float(part) for part in args.rate.split(",") if part.strip()]
+    if not rates:
+        raise ValueError("rate list is empty")
+    print(
+        "pace: rate Hz | cycles | missed | jitter ms p50/p99/max | "
+        "compute ms p50/p99/max | slot use p50 | max sustainable Hz"
+    )
+    for rate in rates:
+        params, _compound_cfg, _secrets, state = build_setup(args)
+        if args.prefetch_workers > 0:
+            with PipelinedDevice(
+                params, state, 0, args.cycles, args.prefetch_workers, args.prefetch_depth, args.prefetch_chunk
+            ) as device:
+                device.warm_up()
+                stats = asyncio.run(run_paced(params, state, rate, args.cycles, device=device))
+        else:
+            stats = asyncio.run(run_paced(params, state, rate, args.cycles))
+        pacing_report(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Multi-process lane farm: each provider lane runs in its own process.
+
+The device (this process) runs device_cycle and writes each routed token into
+the selected lane's shared-memory ring; lanes recompute their own token, compare
+and post the verdict back through a second ring. Records are fixed-size structs
+written straight into `multiprocessing.shared_memory`, so nothing is pickled
+per cycle. Rings are single-producer/single-consumer with monotonically
+increasing head/tail counters; a record is fully written before the head that
+publishes it. Each inbox also has a wakeup semaphore released once per pushed
+record, so an idle lane blocks in the kernel instead of spinning on the ring
+and taking CPU from the device. Every wait loop checks that the processes on
+the other end are still alive once it starts sleeping, so a crashed lane fails
+the run with an error naming it instead of hanging the device.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import struct
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional, Sequence
+
+from .cli import build_parser, build_setup, parse_x_list
+from .core import DeviceState, Params, ProviderSecrets, device_cycle, provider_cycle
+
+RESULT = struct.Struct("<QQQB")
+STOP_T = (1 << 64) - 1
+
+
+class ShmRing:
+    """SPSC ring of fixed-size records in a shared memory segment."""
+
+    # Counters are native aligned 8-byte words updated through a 'Q' memoryview,
+    # i.e. one store each; struct.pack_into zero-fills before writing, which a
+    # reader in another process could observe as a torn counter.
+    HEAD_INDEX = 0
+    TAIL_INDEX = 8
+    DATA_OFFSET = 128
+
+    def __init__(self, record_size: int, capacity: int, name: Optional[str] = None) -> None:
+        self.record_size = record_size
+        self.capacity = capacity
+        size = self.DATA_OFFSET + record_size * capacity
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.buf = self.shm.buf
+        self.counters = self.buf[:self.DATA_OFFSET].cast("Q")
+        self._head = self.counters[self.HEAD_INDEX]
+        self._tail = self.counters[self.TAIL_INDEX]
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def try_push(self, pack: struct.Struct, *values: object) -> bool:
+        if self._head - self.counters[self.TAIL_INDEX] >= self.capacity:
+            return False
+        slot = self.DATA_OFFSET + (self._head % self.capacity) * self.record_size
+        pack.pack_into(self.buf, slot, *values)
+        self._head += 1
+        self.counters[self.HEAD_INDEX] = self._head
+        return True
+
+    def push(self, pack: struct.Struct, *values: object, check: Optional[Callable[[], None]] = None) -> None:
+        """Push, waiting for space; `check` runs while sleeping and may raise."""
+        spins = 0
+        while not self.try_push(pack, *values):
+            spins = _backoff(spins, check)
+
+    def try_pop(self, pack: struct.Struct) -> Optional[tuple]:
+        if self.counters[self.HEAD_INDEX] <= self._tail:
+            return None
+        slot = self.DATA_OFFSET + (self._tail % self.capacity) * self.record_size
+        values = pack.unpack_from(self.buf, slot)
+        self._tail += 1
+        self.counters[self.TAIL_INDEX] = self._tail
+        return values
+
+    def close(self) -> None:
+        self.counters.release()
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _backoff(spins: int, check: Optional[Callable[[], None]] = None) -> int:
+    if spins < 16:
+        return spins + 1
+    if check is not None:
+        check()
+    time.sleep(0.0001)
+    return spins + 1
+
+
+def _check_lane(lane: int, proc: multiprocessing.process.BaseProcess) -> None:
+    if not proc.is_alive():
+        raise RuntimeError(f"lane {lane} process died (exit code {proc.exitcode})")
+
+
+def _check_device() -> None:
+    parent = multiprocessing.parent_process()
+    if parent is not None and not parent.is_alive():
+        raise RuntimeError("device process died")
+
+
+def token_record(params: Params) -> struct.Struct:
+    return struct.Struct(f"<QQ{params.token_bytes}s")
+
+
+def lane_main(
+    lane: int,
+    params: Params,
+    secrets: ProviderSecrets,
+    in_name: str,
+    out_name: str,
+    capacity: int,
+    ready,
+    wakeup,
+) -> None:
+    record = token_record(params)
+    inbox = ShmRing(record.size, capacity, name=in_name)
+    outbox = ShmRing(RESULT.size, capacity, name=out_name)
+    ready.release()
+    try:
+        while True:
+            # One release per pushed record, after its head is published.
+            wakeup.acquire()
+            item = inbox.try_pop(record)
+            while item is None:
+                item = inbox.try_pop(record)
+            t, sent_ns, raw = item
+            if t == STOP_T:
+                return
+            recv_ns = time.monotonic_ns()
+            expected = provider_cycle(t, lane, params, secrets)
+            ok = int(expected == int.from_bytes(raw, "big"))
+            outbox.push(RESULT, t, sent_ns, recv_ns, ok, check=_check_device)
+    finally:
+        inbox.close()
+        outbox.close()
+
+
+@dataclass
+class FarmStats:
+    x: int
+    cycles: int
+    elapsed: float
+    device_busy: float
+    mismatches: int
+    queue_ns: List[int]
+    e2e_ns: List[int]
+
+    @property
+    def throughput(self) -> float:
+        return self.cycles / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+def _percentile(values: List[int], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] / 1e6
+
+
+def run_farm(
+    params: Params,
+    secrets: List[ProviderSecrets],
+    state: DeviceState,
+    cycles: int,
+    capacity: int = 1024,
+    start_method: Optional[str] = None,
+) -> FarmStats:
+    """Drive `cycles` device cycles through x lane processes and collect verdicts."""
+    ctx = multiprocessing.get_context(start_method)
+    record = token_record(params)
+    inboxes = [ShmRing(record.size, capacity) for _ in range(params.x)]
+    outboxes = [ShmRing(RESULT.size, capacity) for _ in range(params.x)]
+    ready = ctx.Semaphore(0)
+    wakeups = [ctx.Semaphore(0) for _ in range(params.x)]
+    procs = [
+        ctx.Process(
+            target=lane_main,
+            args=(
+                lane,
+                params,
+                secrets[lane],
+                inboxes[lane].name,
+                outboxes[lane].name,
+                capacity,
+                ready,
+                wakeups[lane],
+            ),
+            daemon=True,
+        )
+        for lane in range(params.x)
+    ]
+    queue_ns: List[int] = []
+    e2e_ns: List[int] = []
+    mismatches = 0
+    received = 0
+    device_busy = 0.0
+
+    def check() -> None:
+        for lane, proc in enumerate(procs):
+            _check_lane(lane, proc)
+
+    def drain() -> int:
+        nonlocal mismatches
+        count = 0
+        now = time.monotonic_ns()
+        for outbox in outboxes:
+            while True:
+                item = outbox.try_pop(RESULT)
+                if item is None:
+                    break
+                t, sent_ns, recv_ns, ok = item
+                queue_ns.append(recv_ns - sent_ns)
+                e2e_ns.append(now - sent_ns)
+                if not ok:
+                    mismatches += 1
+                count += 1
+        return count
+
+    try:
+        for proc in procs:
+            proc.start()
+        deadline = time.monotonic() + 60
+        for _ in procs:
+            while not ready.acquire(timeout=0.1):
+                check()
+                if time.monotonic() > deadline:
+                    raise RuntimeError("lane process failed to start")
+        began = time.perf_counter()
+        for t in range(cycles):
+            tick = time.perf_counter()
+            idx, token = device_cycle(t, params, state)
+            device_busy += time.perf_counter() - tick
+            inbox = inboxes[idx]
+            spins = 0
+            while not inbox.try_push(record, t, time.monotonic_ns(), token.to_bytes(params.token_bytes, "big")):
+                received += drain()
+                spins = _backoff(spins, check)
+            wakeups[idx].release()
+            received += drain()
+        spins = 0
+        while received < cycles:
+            got = drain()
+            received += got
+            spins = 0 if got else _backoff(spins, check)
+        elapsed = time.perf_counter() - began
+        for lane, (inbox, wakeup) in enumerate(zip(inboxes, wakeups)):
+            inbox.push(record, STOP_T, 0, bytes(params.token_bytes), check=lambda: _check_lane(lane, procs[lane]))
+            wakeup.release()
+        for proc in procs:
+            proc.join(timeout=5)
+    finally:
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+        for ring in inboxes + outboxes:
+            ring.close()
+    return FarmStats(
+        x=params.x,
+        cycles=cycles,
+        elapsed=elapsed,
+        device_busy=device_busy,
+        mismatches=mismatches,
+        queue_ns=queue_ns,
+        e2e_ns=e2e_ns,
+    )
+
+
+def farm_report(stats: FarmStats) -> None:
+    print(
+        f"farm: {stats.x} | {stats.cycles} | {stats.throughput:.1f} | "
+        f"{stats.device_busy / stats.elapsed * 100:.0f}% | "
+        f"{_percentile(stats.queue_ns, 0.5):.3f}/{_percentile(stats.queue_ns, 0.99):.3f} | "
+        f"{_percentile(stats.e2e_ns, 0.5):.3f}/{_percentile(stats.e2e_ns, 0.99):.3f}/"
+        f"{max(stats.e2e_ns, default=0) / 1e6:.3f} | {stats.mismatches}"
+    )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = build_parser()
+    parser.description = "PCPL shared-memory multi-process lane farm."
+    parser.add_argument(
+        "--farm-x",
+        type=str,
+        default="",
+        help="Comma-separated lane counts to run (defaults to --x).",
+    )
+    parser.add_argument("--ring-capacity", type=int, default=1024, help="Records per shared-memory ring.")
+    parser.add_argument(
+        "--start-method",
+        choices=("fork", "spawn", "forkserver"),
+        default=None,
+        help="multiprocessing start method for lane processes.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    x_values = parse_x_list(args.farm_x, label="farm-x") if args.farm_x else [args.x]
+    print("farm: x | cycles | cycles/s | device busy | queue ms p50/p99 | e2e ms p50/p99/max | mismatches")
+    for x in x_values:
+        args.x = x
+        params, _compound_cfg, secrets, state = build_setup(args)
+        stats = run_farm(params, secrets, state, args.cycles, args.ring_capacity, args.start_method)
+        farm_report(stats)
+        cores = os.cpu_count() or 1
+        if x + 1 > cores:
+            print(
+                f"farm: note: x={x} lanes plus the device exceed {cores} core(s); "
+                "busy lanes share cores with the device, so cycles/s includes scheduler contention"
+            )
+        if stats.mismatches:
+            raise AssertionError(f"x={x}: {stats.mismatches} routed tokens failed lane verification")
+
+
+if __name__ == "__main__":
+    main()
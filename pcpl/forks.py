@@ -0,0 +1,422 @@
+"""
+Multi-fork token stream engine.
+
+A fork k runs the base circuit with its own perm_key, seed chain and lane
+states, and alternates between its variable sets V_k (lane bouquets) over
+windows W_k of its own length and offset. Everything public per cycle is
+computed once and fanned out: the phase record, the bouquet exponent vectors
+(they depend on t but not on any secret) and, with enough forks, p^e mod M for
+every prime p of the compound pool. A compound that factors over the pool is
+then a few small multiplications instead of a full modular exponentiation;
+each fork only adds its KDF/TOK and EVOLVE hashes. A fork packs its compounds
+into flat arrays (residues mod M plus pool factorizations) rather than nested
+tuples of ints, so per-fork memory stays close to the encoded size; the report
+gives the size measured with tracemalloc.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from .cli import build_parser, build_setup, parse_x_list
+from .core import (
+    CompoundConfig,
+    Params,
+    ProviderSecrets,
+    backend_for,
+    derive_seed,
+    evolve_seed,
+    exponent_vector,
+    generate_provider_secrets,
+    lane_token,
+    lane_token_from_values,
+    permutation_for_block,
+    phase_clock,
+    phase_range,
+    trunc_bits,
+)
+
+@dataclass(frozen=True)
+class CompoundTable:
+    """Every compound of a fork, flattened in (set, lane, bouquet, position) order.
+
+    Compound k is residues[k] (value mod M) with pool factorization
+    factors[offsets[k]:offsets[k + 1]] as (pool index, multiplicity) pairs; the
+    factorization is empty when the compound does not factor over the pool.
+    Residues live in an array('Q') when M fits in 64 bits.
+    """
+
+    lanes: int
+    num_compounds: int
+    residues: Union[array, Tuple[int, ...]]
+    offsets: array
+    factors: array
+
+    @property
+    def sets(self) -> int:
+        return len(self.residues) // (self.lanes * 3 * self.num_compounds)
+
+    def bouquet_start(self, variable_set: int, lane: int, bouquet: int) -> int:
+        return ((variable_set * self.lanes + lane) * 3 + bouquet) * self.num_compounds
+
+
+@dataclass
+class ForkState:
+    perm_key: bytes
+    compounds: CompoundTable
+    window: int
+    offset: int
+    W: List[int]
+    S: bytes
+    block: int = -1
+    perm: Sequence[int] = ()
+
+    def active_set(self, t: int) -> int:
+        """Index of the variable set in force at cycle t."""
+        return ((t + self.offset) // self.window) % self.compounds.sets
+
+
+def _factor_over_pool(value: int, pool: Sequence[int]) -> Tuple[Tuple[int, int], ...]:
+    factors = []
+    for i, prime in enumerate(pool):
+        multiplicity = 0
+        while value % prime == 0:
+            value //= prime
+            multiplicity += 1
+        if multiplicity:
+            factors.append((i, multiplicity))
+    return tuple(factors) if value == 1 else ()
+
+
+def _compound_table(
+    values: Iterable[int],
+    params: Params,
+    pool: Sequence[int],
+    num_compounds: int,
+) -> CompoundTable:
+    residues = []
+    offsets = array("I", [0])
+    factors = array("H")
+    for value in values:
+        residue = value % params.M
+        if residue == 0:
+            raise ValueError("Compound is divisible by M; choose different primes")
+        residues.append(residue)
+        for pair in _factor_over_pool(value, pool):
+            factors.extend(pair)
+        offsets.append(len(factors))
+    return CompoundTable(
+        lanes=params.x,
+        num_compounds=num_compounds,
+        residues=array("Q", residues) if params.M < 1 << 64 else tuple(residues),
+        offsets=offsets,
+        factors=factors,
+    )
+
+
+def _bouquet_value(
+    table: CompoundTable,
+    start: int,
+    exponents: Sequence[int],
+    M: int,
+    pool_powers: Optional[List[List[int]]],
+) -> int:
+    """prod_j c_j^e_j mod M over the bouquet at `start`, from the pool powers
+    p^e_j where the factorization is known."""
+    residues, offsets, factors = table.residues, table.offsets, table.factors
+    acc = 1 % M
+    for j, exponent in enumerate(exponents):
+        k = start + j
+        lo, hi = offsets[k], offsets[k + 1]
+        if pool_powers is not None and lo < hi:
+            row = pool_powers[j]
+            for f in range(lo, hi, 2):
+                i, multiplicity = factors[f], factors[f + 1]
+                acc = acc * (row[i] if multiplicity == 1 else pow(row[i], multiplicity, M)) % M
+        else:
+            acc = acc * pow(residues[k], exponent, M) % M
+    return acc
+
+
+def build_forks(
+    params: Params,
+    compound_cfg: CompoundConfig,
+    seed: int,
+    count: int,
+    sets: int = 2,
+    window: int = 64,
+) -> List[ForkState]:
+    """Derive `count` forks with `sets` variable sets each and window lengths in [window, 2 * window]."""
+    if count < 1 or sets < 1 or window < 1:
+        raise ValueError("count, sets and window must be positive")
+    h = backend_for(params).h
+    pool = compound_cfg.prime_pool
+    token_hash_len = max(32, params.token_bytes)
+    forks = []
+    for k in range(count):
+        rng = random.Random(derive_seed(seed, f"FORK{k}", params.hash_backend))
+        values = []
+        for _ in range(sets * params.x):
+            secrets = generate_provider_secrets(rng, compound_cfg)
+            values.extend(secrets.bouquetA)
+            values.extend(secrets.bouquetB)
+            values.extend(secrets.bouquetC)
+        fork_window = rng.randint(window, 2 * window)
+        seed_material = rng.getrandbits(256).to_bytes(32, "big")
+        forks.append(ForkState(
+            perm_key=h(seed_material, "PERMKEY", out_len=32),
+            compounds=_compound_table(values, params, pool, compound_cfg.num_compounds),
+            window=fork_window,
+            offset=rng.randrange(fork_window),
+            W=[
+                trunc_bits(h(seed_material, "W", i, out_len=token_hash_len), params.token_bits)
+                for i in range(params.x)
+            ],
+            S=h(seed_material, "SEED", out_len=params.seed_bytes),
+        ))
+    return forks
+
+
+def fork_encoded_bytes(params: Params, fork: ForkState) -> int:
+    """Encoded size of a fork: lane states, seed, perm_key, block schedule and
+    compounds (residues plus one byte each per factor index and multiplicity)."""
+    table = fork.compounds
+    return (
+        params.x * params.token_bytes
+        + params.seed_bytes
+        + len(fork.perm_key)
+        + params.x
+        + len(table.residues) * params.mod_bytes
+        + len(table.factors)
+    )
+
+
+def measure_forks(
+    params: Params,
+    compound_cfg: CompoundConfig,
+    seed: int,
+    count: int,
+    sets: int = 2,
+    window: int = 64,
+) -> Tuple[List[ForkState], int]:
+    """build_forks plus the Python heap it retains, measured with tracemalloc."""
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    forks = build_forks(params, compound_cfg, seed, count, sets, window)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    if not tracing:
+        tracemalloc.stop()
+    return forks, retained
+
+
+class ForkEngine:
+    """Steps every fork through the same cycles, sharing the public per-cycle work.
+
+    Pool power tables cost 3 * num_compounds * len(pool) exponentiations per
+    cycle and save about 3 * num_compounds per fork, so they are only built
+    once there are at least as many forks as pool primes.
+    """
+
+    def __init__(self, params: Params, compound_cfg: CompoundConfig, forks: List[ForkState]) -> None:
+        self.params = params
+        self.num_compounds = compound_cfg.num_compounds
+        self.pool = [prime % params.M for prime in compound_cfg.prime_pool]
+        self.forks = forks
+        self.use_pool_powers = len(forks) >= len(self.pool)
+        self.shared_time = 0.0
+
+    def _pool_powers(self, exponents: Sequence[int]) -> Optional[List[List[int]]]:
+        if not self.use_pool_powers:
+            return None
+        M = self.params.M
+        return [[pow(prime, exponent, M) for prime in self.pool] for exponent in exponents]
+
+    def step(self, t: int) -> None:
+        params = self.params
+        tick = time.perf_counter()
+        phase = phase_clock(t, params)
+        exps_a = exponent_vector(self.num_compounds, phase.a, phase.u1, params)
+        exps_b = exponent_vector(self.num_compounds, phase.b, phase.u2, params)
+        exps_c = exponent_vector(self.num_compounds, phase.c, phase.u3, params)
+        powers_a = self._pool_powers(exps_a)
+        powers_b = self._pool_powers(exps_b)
+        powers_c = self._pool_powers(exps_c)
+        block, slot = divmod(t, params.x)
+        phi_block = phase_clock(block * params.x, params).phi
+        self.shared_time += time.perf_counter() - tick
+
+        M = params.M
+        for fork in self.forks:
+            if fork.block != block:
+                fork.perm = permutation_for_block(block, params, fork.perm_key, phi_block)
+                fork.block = block
+            idx = fork.perm[slot]
+            table = fork.compounds
+            start = table.bouquet_start(fork.active_set(t), idx, 0)
+            nc = self.num_compounds
+            fork.W[idx] = lane_token_from_values(
+                idx,
+                t,
+                phase,
+                params,
+                _bouquet_value(table, start, exps_a, M, powers_a),
+                _bouquet_value(table, start + nc, exps_b, M, powers_b),
+                _bouquet_value(table, start + 2 * nc, exps_c, M, powers_c),
+            )
+            fork.S = evolve_seed(params, fork.S, fork.W, phase.phi)
+
+    def run(self, start: int, cycles: int) -> None:
+        for t in range(start, start + cycles):
+            self.step(t)
+
+
+def step_fork_unshared(params: Params, fork: ForkState, t: int) -> None:
+    """One cycle of one fork as a stand-alone simulation: its own phase and exponents."""
+    phase = phase_range(t, 1, params)[0]
+    block, slot = divmod(t, params.x)
+    if fork.block != block:
+        phi_block = phase_range(block * params.x, 1, params)[0].phi
+        fork.perm = permutation_for_block(block, params, fork.perm_key, phi_block)
+        fork.block = block
+    idx = fork.perm[slot]
+    table = fork.compounds
+    start = table.bouquet_start(fork.active_set(t), idx, 0)
+    nc = table.num_compounds
+    residues = list(table.residues[start : start + 3 * nc])
+    secrets = ProviderSecrets(
+        bouquetA=residues[:nc],
+        bouquetB=residues[nc : 2 * nc],
+        bouquetC=residues[2 * nc :],
+    )
+    fork.W[idx] = lane_token(idx, t, phase, params, secrets)
+    fork.S = evolve_seed(params, fork.S, fork.W, phase.phi)
+
+
+@dataclass
+class ForkStats:
+    forks: int
+    cycles: int
+    elapsed: float
+    shared_time: float
+    encoded_bytes: int
+    measured_bytes: int
+    baseline_elapsed: Optional[float] = None
+
+    @property
+    def throughput(self) -> float:
+        """Fork-cycles (tokens emitted) per second."""
+        return self.forks * self.cycles / self.elapsed if self.elapsed > 0 else float("inf")
+
+    @property
+    def baseline_throughput(self) -> Optional[float]:
+        if self.baseline_elapsed is None:
+            return None
+        return self.forks * self.cycles / self.baseline_elapsed if self.baseline_elapsed > 0 else float("inf")
+
+
+def run_forks(
+    params: Params,
+    compound_cfg: CompoundConfig,
+    seed: int,
+    count: int,
+    cycles: int,
+    sets: int = 2,
+    window: int = 64,
+    baseline: bool = False,
+) -> ForkStats:
+    """Run `count` forks for `cycles` cycles; with `baseline`, also step each fork
+    stand-alone and check that both reach the same W and S."""
+    forks, retained = measure_forks(params, compound_cfg, seed, count, sets, window)
+    engine = ForkEngine(params, compound_cfg, forks)
+    began = time.perf_counter()
+    engine.run(0, cycles)
+    elapsed = time.perf_counter() - began
+    stats = ForkStats(
+        forks=count,
+        cycles=cycles,
+        elapsed=elapsed,
+        shared_time=engine.shared_time,
+        encoded_bytes=fork_encoded_bytes(params, forks[0]),
+        measured_bytes=retained // count,
+    )
+    if baseline:
+        reference = build_forks(params, compound_cfg, seed, count, sets, window)
+        began = time.perf_counter()
+        for t in range(cycles):
+            for fork in reference:
+                step_fork_unshared(params, fork, t)
+        stats.baseline_elapsed = time.perf_counter() - began
+        for k, (fork, ref) in enumerate(zip(forks, reference)):
+            if fork.W != ref.W or fork.S != ref.S:
+                raise AssertionError(f"Fork {k} diverged from its stand-alone simulation")
+    return stats
+
+
+def fork_report(stats: ForkStats) -> None:
+    baseline = stats.baseline_throughput
+    baseline_text = "- | -" if baseline is None else f"{baseline:.1f} | {stats.throughput / baseline:.1f}x"
+    print(
+        f"forks: {stats.forks} | {stats.cycles} | {stats.throughput:.1f} | {baseline_text} | "
+        f"{stats.shared_time / max(1, stats.cycles) * 1e6:.1f} | "
+        f"{(stats.elapsed - stats.shared_time) / max(1, stats.forks * stats.cycles) * 1e6:.1f} | "
+        f"{stats.encoded_bytes} | {stats.measured_bytes}"
+    )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = build_parser()
+    parser.description = "PCPL multi-fork token stream engine."
+    parser.add_argument(
+        "--forks",
+        type=str,
+        default="1,10,100,1000",
+        help="Comma-separated fork counts to run.",
+    )
+    parser.add_argument("--fork-sets", type=int, default=2, help="Variable sets V_k per fork.")
+    parser.add_argument(
+        "--fork-window",
+        type=int,
+        default=64,
+        help="Minimum window length in cycles; each fork draws its own in [w, 2w].",
+    )
+    parser.add_argument(
+        "--fork-baseline",
+        action="store_true",
+        help="Also run every fork as a stand-alone simulation and check the states match.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    counts = parse_x_list(args.forks, minimum=1, label="forks")
+    params, compound_cfg, _secrets, _state = build_setup(args)
+    print(
+        "forks: forks | cycles | fork-cycles/s | stand-alone fork-cycles/s | speedup | "
+        "shared us/cycle | per-fork us/cycle | encoded B/fork | measured B/fork"
+    )
+    for count in counts:
+        fork_report(
+            run_forks(
+                params,
+                compound_cfg,
+                args.seed,
+                count,
+                args.cycles,
+                args.fork_sets,
+                args.fork_window,
+                args.fork_baseline,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
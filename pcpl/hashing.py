@@ -0,0 +1,190 @@
+"""
+Hash backends for the PCPL roles (PHASE, PERM*, R, EXP, KDF, TOK, EVOLVE, ...).
+
+Every backend hashes the same length-prefixed parts but applies its own domain
+separation. Counting invocations per role (the last string part of a call) is
+opt-in via `counting`, so the default path costs no more than `h_bytes`, the
+original blake2b construction that stays the default.
+"""
+
+from __future__ import annotations
+
+import abc
+import hashlib
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+
+def _encode_part(part: object) -> bytes:
+    if isinstance(part, bytes):
+        tag = b"B"
+        payload = part
+    elif isinstance(part, str):
+        tag = b"S"
+        payload = part.encode("ascii")
+    elif isinstance(part, int):
+        if part < 0:
+            raise ValueError("Negative integers are not supported")
+        payload = b"\x00" if part == 0 else part.to_bytes((part.bit_length() + 7) // 8, "big")
+        tag = b"I"
+    else:
+        raise TypeError(f"Unsupported part type: {type(part)}")
+    return tag + len(payload).to_bytes(4, "big") + payload
+
+
+def h_bytes(*parts: object, out_len: int = 32) -> bytes:
+    if not (1 <= out_len <= 64):
+        raise ValueError("out_len must be between 1 and 64 bytes for blake2b")
+    hasher = hashlib.blake2b(digest_size=out_len)
+    for part in parts:
+        hasher.update(_encode_part(part))
+    return hasher.digest()
+
+
+def _role_of(parts: Tuple[object, ...]) -> Tuple[str, int]:
+    for i in range(len(parts) - 1, -1, -1):
+        if isinstance(parts[i], str):
+            return parts[i], i
+    return "", -1
+
+
+class HashBackend(abc.ABC):
+    """Base backend. `h` is the hot path, so each backend implements it in one
+    frame: count (only when `counting` is set), check out_len, digest."""
+
+    name = ""
+    max_out_len: Optional[int] = None
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, int] = {}
+        self.counting = False
+        self.lock = threading.Lock()
+
+    @abc.abstractmethod
+    def h(self, *parts: object, out_len: int = 32) -> bytes:
+        """Digest of the tagged `parts`, `out_len` bytes long."""
+
+    def _count(self, parts: Tuple[object, ...]) -> None:
+        role = _role_of(parts)[0]
+        with self.lock:
+            self.calls[role] = self.calls.get(role, 0) + 1
+
+    def _bad_out_len(self) -> ValueError:
+        return ValueError(f"out_len must be between 1 and {self.max_out_len} bytes for {self.name}")
+
+    def reset_counts(self) -> None:
+        with self.lock:
+            self.calls = {}
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+class Blake2Backend(HashBackend):
+    """Unkeyed BLAKE2 over the tagged parts; the role is just another part."""
+
+    def __init__(self, name: str, factory: Callable[..., "hashlib._Hash"], max_out_len: int) -> None:
+        super().__init__()
+        self.name = name
+        self.factory = factory
+        self.max_out_len = max_out_len
+
+    def h(self, *parts: object, out_len: int = 32) -> bytes:
+        if self.counting:
+            self._count(parts)
+        if not 1 <= out_len <= self.max_out_len:
+            raise self._bad_out_len()
+        hasher = self.factory(digest_size=out_len)
+        for part in parts:
+            hasher.update(_encode_part(part))
+        return hasher.digest()
+
+
+class KeyedBlake2Backend(HashBackend):
+    """BLAKE2b keyed by the role: the key block is absorbed once per (role, length)
+    and the cached state is copied per call, so the role is not re-hashed."""
+
+    name = "keyed-blake2b"
+    max_out_len = 64
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.states: Dict[Tuple[str, int], "hashlib._Hash"] = {}
+
+    def h(self, *parts: object, out_len: int = 32) -> bytes:
+        if self.counting:
+            self._count(parts)
+        if not 1 <= out_len <= self.max_out_len:
+            raise self._bad_out_len()
+        role, index = _role_of(parts)
+        state = self.states.get((role, out_len))
+        if state is None:
+            state = hashlib.blake2b(digest_size=out_len, key=role.encode("ascii"), person=b"PCPL")
+            self.states[(role, out_len)] = state
+        hasher = state.copy()
+        for i, part in enumerate(parts):
+            if i != index:
+                hasher.update(_encode_part(part))
+        return hasher.digest()
+
+
+class Sha256Backend(HashBackend):
+    """SHA-256 with the role as a length-prefixed prefix; output truncated."""
+
+    name = "sha256"
+    max_out_len = 32
+
+    def h(self, *parts: object, out_len: int = 32) -> bytes:
+        if self.counting:
+            self._count(parts)
+        if not 1 <= out_len <= self.max_out_len:
+            raise self._bad_out_len()
+        hasher = hashlib.sha256(b"PCPL-SHA256" + _encode_part(_role_of(parts)[0]))
+        for part in parts:
+            hasher.update(_encode_part(part))
+        return hasher.digest()[:out_len]
+
+
+class ShakeBackend(HashBackend):
+    """SHAKE XOF with a role prefix; any output length (tokens above 512 bits)."""
+
+    def __init__(self, name: str, factory: Callable[..., "hashlib._Hash"], label: bytes) -> None:
+        super().__init__()
+        self.name = name
+        self.factory = factory
+        self.label = label
+
+    def h(self, *parts: object, out_len: int = 32) -> bytes:
+        if self.counting:
+            self._count(parts)
+        if out_len < 1:
+            raise self._bad_out_len()
+        hasher = self.factory(self.label + _encode_part(_role_of(parts)[0]))
+        for part in parts:
+            hasher.update(_encode_part(part))
+        return hasher.digest(out_len)
+
+
+BACKEND_FACTORIES: Dict[str, Callable[[], HashBackend]] = {
+    "blake2b": lambda: Blake2Backend("blake2b", hashlib.blake2b, 64),
+    "blake2s": lambda: Blake2Backend("blake2s", hashlib.blake2s, 32),
+    "keyed-blake2b": KeyedBlake2Backend,
+    "sha256": Sha256Backend,
+    "shake128": lambda: ShakeBackend("shake128", hashlib.shake_128, b"PCPL-SHAKE128"),
+    "shake256": lambda: ShakeBackend("shake256", hashlib.shake_256, b"PCPL-SHAKE256"),
+}
+HASH_BACKENDS = tuple(BACKEND_FACTORIES)
+
+_instances: Dict[str, HashBackend] = {}
+
+
+def get_backend(name: str) -> HashBackend:
+    """Shared backend instance (and call counters) for `name`."""
+    backend = _instances.get(name)
+    if backend is None:
+        factory = BACKEND_FACTORIES.get(name)
+        if factory is None:
+            raise ValueError(f"hash backend must be one of {HASH_BACKENDS}")
+        backend = _instances[name] = factory()
+    return backend
@@ -0,0 +1,162 @@
+"""
+Random-access view of the PCPL schedule and lane tokens.
+
+Apart from the device seed chain S, everything about cycle t is a function of
+t alone: the phase, the routed lane and every lane token. The oracle answers
+those questions for any t (including far beyond anything a sequential run can
+reach) and backs a sampled validation mode. Phases are computed directly from
+t rather than through the shared PhaseClock, so the oracle is an independent
+reference for the cached sequential path the device uses.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import List, Sequence, Tuple
+
+from .core import (
+    DeviceState,
+    Params,
+    Phase,
+    ProviderSecrets,
+    device_cycle,
+    lane_token,
+    permutation_for_block,
+    phase_range,
+)
+
+
+class CycleOracle:
+    def __init__(self, params: Params, perm_key: bytes, secrets: Sequence[ProviderSecrets]) -> None:
+        self.params = params
+        self.perm_key = perm_key
+        self.secrets = list(secrets)
+
+    def phase(self, t: int) -> Phase:
+        return phase_range(t, 1, self.params)[0]
+
+    def block_schedule(self, B: int) -> Sequence[int]:
+        """Permutation pi_B: slot -> lane for block B."""
+        phase_block = self.phase(B * self.params.x)
+        return permutation_for_block(B, self.params, self.perm_key, phase_block.phi)
+
+    def route(self, t: int) -> int:
+        """Lane the device routes cycle t to."""
+        return self.block_schedule(t // self.params.x)[t % self.params.x]
+
+    def expected_token(self, lane: int, t: int) -> int:
+        """Token lane `lane` expects at cycle t (the device token when routed there)."""
+        return lane_token(lane, t, self.phase(t), self.params, self.secrets[lane])
+
+    def lane_tokens(self, t: int) -> List[int]:
+        phase = self.phase(t)
+        return [
+            lane_token(lane, t, phase, self.params, self.secrets[lane])
+            for lane in range(self.params.x)
+        ]
+
+
+@dataclass
+class SampleSummary:
+    cycles: int = 0
+    blocks: int = 0
+    replayed: int = 0
+    failures: List[str] = field(default_factory=list)
+
+
+def parse_cycle_range(value: str) -> Tuple[int, int]:
+    """Parse "LO:HI" where each bound is an int literal or a power like 2^60."""
+
+    def bound(text: str) -> int:
+        text = text.strip().replace("_", "")
+        if "^" in text:
+            base, exp = text.split("^", 1)
+            return int(base, 0) ** int(exp, 0)
+        return int(text, 0)
+
+    if ":" not in value:
+        raise ValueError("range must be LO:HI")
+    lo_text, hi_text = value.split(":", 1)
+    lo, hi = bound(lo_text), bound(hi_text)
+    if not 0 <= lo < hi:
+        raise ValueError("range must satisfy 0 <= LO < HI")
+    return lo, hi
+
+
+def replay_block(oracle: CycleOracle, B: int) -> List[Tuple[int, int]]:
+    """(idx, token) from running device_cycle sequentially over block B.
+
+    Routing and tokens do not depend on S or W, so a fresh device state started
+    at the block boundary emits what the real device would.
+    """
+    params = oracle.params
+    state = DeviceState(
+        W=[0] * params.x,
+        S=bytes(params.seed_bytes),
+        perm_key=oracle.perm_key,
+        secrets=oracle.secrets,
+    )
+    return [device_cycle(t, params, state) for t in range(B * params.x, (B + 1) * params.x)]
+
+
+def validate_sampled(
+    oracle: CycleOracle,
+    samples: int,
+    lo: int,
+    hi: int,
+    rng: random.Random,
+    max_failures: int = 16,
+    replays: int = 4,
+) -> SampleSummary:
+    """Check 1-of-x at random cycles and schedule invariants at random blocks in [lo, hi).
+
+    For each sampled cycle t the routed lane's token must be matched by exactly
+    that lane. For each sampled block the schedule must be a permutation. For
+    the first `replays` sampled cycles the enclosing block is also run through
+    device_cycle from its start, and every emitted lane and token must match
+    the oracle's route and expected token.
+    """
+    params = oracle.params
+    x = params.x
+    summary = SampleSummary()
+    identity = list(range(x))
+    block_lo = -(-lo // x)
+    block_hi = hi // x
+
+    def fail(message: str) -> None:
+        if len(summary.failures) < max_failures:
+            summary.failures.append(message)
+
+    for _ in range(samples):
+        t = rng.randrange(lo, hi)
+        idx = oracle.route(t)
+        tokens = oracle.lane_tokens(t)
+        matches = [lane for lane, token in enumerate(tokens) if token == tokens[idx]]
+        if matches != [idx]:
+            fail(f"Cycle {t} expected match {idx}, got {matches}")
+        summary.cycles += 1
+
+        if summary.replayed < replays:
+            B = t // x
+            for slot, (routed, token) in enumerate(replay_block(oracle, B)):
+                cycle = B * x + slot
+                if routed != oracle.route(cycle):
+                    fail(f"Cycle {cycle} device routes to {routed}, oracle says {oracle.route(cycle)}")
+                    break
+                if token != oracle.expected_token(routed, cycle):
+                    fail(f"Cycle {cycle} device token differs from lane {routed}'s expected token")
+                    break
+            summary.replayed += 1
+
+        if block_lo < block_hi:
+            B = rng.randrange(block_lo, block_hi)
+            perm = list(oracle.block_schedule(B))
+            if sorted(perm) != identity:
+                fail(f"Block {B} permutation is invalid: {perm}")
+            summary.blocks += 1
+
+    if summary.failures:
+        shown = "\n  ".join(summary.failures)
+        raise AssertionError(f"Sampled validation failed:\n  {shown}")
+    return summary
@@ -0,0 +1,236 @@
+"""
+Pipelined device: background prefetch of routed tokens.
+
+Of a device cycle only the EVOLVE step depends on S and W; the phase, the routed
+lane and that lane's token are functions of t, the public parameters, perm_key
+and the lane secrets. A process pool computes (idx, token, phi) for the next
+chunks of cycles into a bounded window of futures, and the main loop only
+consumes them and evolves S, so emission latency is roughly one EVOLVE hash
+instead of a full bouquet exponentiation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional, Sequence, Tuple
+
+from .cli import build_parser, build_setup
+from .core import DeviceState, Params, ProviderSecrets, device_cycle, device_evolve, device_route_token, shared_phase_clock
+
+RoutedToken = Tuple[int, int, bytes]
+
+_PREFETCH_CTX: Optional[Tuple[Params, bytes, Tuple[ProviderSecrets, ...]]] = None
+
+
+def _init_prefetch(params: Params, perm_key: bytes, secrets: Tuple[ProviderSecrets, ...]) -> None:
+    global _PREFETCH_CTX
+    _PREFETCH_CTX = (params, perm_key, secrets)
+
+
+def prefetch_range(start: int, count: int) -> List[RoutedToken]:
+    """(idx, token, phi) for cycles [start, start + count), in a pool worker."""
+    assert _PREFETCH_CTX is not None
+    params, perm_key, secrets = _PREFETCH_CTX
+    shared_phase_clock(params).precompute(start, count)
+    return [device_route_token(t, params, perm_key, secrets) for t in range(start, start + count)]
+
+
+class PipelinedDevice:
+    """Device whose routed tokens are computed ahead by a process pool.
+
+    At most `depth` chunks of `chunk` cycles are in flight or buffered, so the
+    window ahead of the device is bounded by depth * chunk cycles. `step()`
+    returns the same (idx, token) as device_cycle and leaves `state` identical.
+    """
+
+    def __init__(
+        self,
+        params: Params,
+        state: DeviceState,
+        start: int = 0,
+        end: Optional[int] = None,
+        workers: int = 2,
+        depth: int = 8,
+        chunk: int = 64,
+        start_method: Optional[str] = None,
+    ) -> None:
+        if workers < 1 or depth < 1 or chunk < 1:
+            raise ValueError("workers, depth and chunk must be positive")
+        self.params = params
+        self.state = state
+        self.t = start
+        self.end = end
+        self.depth = depth
+        self.chunk = chunk
+        self.next_submit = start
+        self.pending: Deque[Future] = deque()
+        self.buffer: Deque[RoutedToken] = deque()
+        self.stall_time = 0.0
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_prefetch,
+            initargs=(params, state.perm_key, tuple(state.secrets)),
+        )
+        self._fill()
+
+    def _fill(self) -> None:
+        while len(self.pending) < self.depth:
+            count = self.chunk
+            if self.end is not None:
+                count = min(count, self.end - self.next_submit)
+                if count <= 0:
+                    return
+            self.pending.append(self.pool.submit(prefetch_range, self.next_submit, count))
+            self.next_submit += count
+
+    def warm_up(self) -> None:
+        """Block until the initial prefetch window is computed."""
+        for future in self.pending:
+            future.result()
+
+    def step(self) -> Tuple[int, int]:
+        """Emit the next cycle: take its prefetched token and evolve S."""
+        if self.end is not None and self.t >= self.end:
+            raise IndexError("pipelined device is past its end cycle")
+        if not self.buffer:
+            future = self.pending.popleft()
+            if not future.done():
+                tick = time.perf_counter()
+                self.buffer.extend(future.result())
+                self.stall_time += time.perf_counter() - tick
+            else:
+                self.buffer.extend(future.result())
+            self._fill()
+        idx, token, phi = self.buffer.popleft()
+        device_evolve(self.params, self.state, idx, token, phi)
+        self.t += 1
+        return idx, token
+
+    def close(self) -> None:
+        for future in self.pending:
+            future.cancel()
+        self.pool.shutdown(wait=True)
+
+    def __enter__(self) -> "PipelinedDevice":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+@dataclass
+class PipelineStats:
+    mode: str
+    cycles: int
+    elapsed: float = 0.0
+    stall_time: float = 0.0
+    latency: List[float] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        return self.cycles / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def percentile(self, q: float) -> float:
+        if not self.latency:
+            return 0.0
+        ordered = sorted(self.latency)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_sequential(params: Params, state: DeviceState, cycles: int) -> PipelineStats:
+    stats = PipelineStats(mode="sequential", cycles=cycles)
+    began = time.perf_counter()
+    for t in range(cycles):
+        tick = time.perf_counter()
+        device_cycle(t, params, state)
+        stats.latency.append(time.perf_counter() - tick)
+    stats.elapsed = time.perf_counter() - began
+    return stats
+
+
+def run_pipelined(
+    params: Params,
+    state: DeviceState,
+    cycles: int,
+    workers: int,
+    depth: int,
+    chunk: int,
+    start_method: Optional[str] = None,
+) -> PipelineStats:
+    """Run `cycles` cycles through a PipelinedDevice.
+
+    Timing starts before the pool is created, so pool start-up and the initial
+    prefetch window count against throughput like any other cycle.
+    """
+    stats = PipelineStats(mode=f"pipelined/{workers}", cycles=cycles)
+    began = time.perf_counter()
+    with PipelinedDevice(params, state, 0, cycles, workers, depth, chunk, start_method) as device:
+        for _ in range(cycles):
+            tick = time.perf_counter()
+            device.step()
+            stats.latency.append(time.perf_counter() - tick)
+        stats.elapsed = time.perf_counter() - began
+        stats.stall_time = device.stall_time
+    return stats
+
+
+def pipeline_report(stats: PipelineStats) -> None:
+    ms = 1e3
+    print(
+        f"pipeline: {stats.mode} | {stats.cycles} | {stats.throughput:.1f} | "
+        f"{stats.percentile(0.5) * ms:.3f}/{stats.percentile(0.99) * ms:.3f}/"
+        f"{max(stats.latency, default=0.0) * ms:.3f} | {stats.stall_time * ms:.1f}"
+    )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = build_parser()
+    parser.description = "PCPL pipelined device with background token prefetch."
+    parser.add_argument("--prefetch-workers", type=int, default=2, help="Prefetch processes.")
+    parser.add_argument("--prefetch-depth", type=int, default=8, help="Chunks in flight or buffered.")
+    parser.add_argument("--prefetch-chunk", type=int, default=64, help="Cycles per prefetch task.")
+    parser.add_argument(
+        "--start-method",
+        choices=("fork", "spawn", "forkserver"),
+        default=None,
+        help="multiprocessing start method for prefetch processes.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    window = args.prefetch_depth * args.prefetch_chunk
+    if args.cycles <= window:
+        print(
+            f"pipeline: warning: --cycles {args.cycles} fits in the {window}-cycle prefetch window; "
+            "the run is dominated by pool start-up and the first fill, not steady state"
+        )
+    print("pipeline: mode | cycles | cycles/s | emit ms p50/p99/max | stall ms")
+    params, _compound_cfg, _secrets, seq_state = build_setup(args)
+    seq = run_sequential(params, seq_state, args.cycles)
+    pipeline_report(seq)
+    params, _compound_cfg, _secrets, pipe_state = build_setup(args)
+    piped = run_pipelined(
+        params,
+        pipe_state,
+        args.cycles,
+        args.prefetch_workers,
+        args.prefetch_depth,
+        args.prefetch_chunk,
+        args.start_method,
+    )
+    pipeline_report(piped)
+    if pipe_state.S != seq_state.S or pipe_state.W != seq_state.W:
+        raise AssertionError("pipelined device state diverged from the sequential device")
+    print(f"OK: pipelined state matches sequential after {args.cycles} cycles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Long-lived PCPL worker that keeps params and fixtures warm between requests.
+
+Requests are JSON objects, one per line, read from stdin or a Unix socket. A
+line may also hold a JSON list of requests, answered with a list of responses
+in the same order. Every request has an "op", an optional "id" echoed back and
+an optional "config" with CLI-style setup options (x, seed, token_bits, ...).
+
+Ops:
+- ping: liveness check.
+- params: P, Q, R, M and schedule period for the config.
+- route: destination lane for one or more cycles ("t").
+- lane_tokens: provider tokens at cycle "t" for "lanes" (default: all).
+- device: device output for "cycles" cycles from "start".
+- validate: run validate_cycles for "cycles" cycles from "start".
+- shutdown: stop the worker after replying.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import os
+import socketserver
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+from .cli import build_setup, parse_args as parse_cli_args
+from .core import (
+    CompoundConfig,
+    DeviceState,
+    Params,
+    ProviderSecrets,
+    device_cycle,
+    device_destination_provider,
+    phase_clock,
+    provider_cycle,
+    schedule_period,
+)
+from .validate import fast_forward, validate_chaining, validate_cycles
+
+SETUP_KEYS = (
+    "x",
+    "seed",
+    "token_bits",
+    "prime_mode",
+    "prime_bits",
+    "modulus_bits",
+    "perm_mode",
+    "hash_backend",
+    "compound_mode",
+    "compound_count",
+    "compound_primes",
+    "compound_offset",
+    "compound_prime_bits",
+    "compound_pool_size",
+)
+
+
+@dataclass
+class WarmFixture:
+    args: argparse.Namespace
+    params: Params
+    compound_cfg: CompoundConfig
+    secrets: List[ProviderSecrets]
+    pristine: DeviceState
+    cursor: DeviceState
+    cursor_t: int = 0
+
+    def state_at(self, t: int) -> DeviceState:
+        """Return a private state at cycle t, reusing the warm cursor when possible."""
+        if t < self.cursor_t:
+            self.cursor = copy.deepcopy(self.pristine)
+            self.cursor_t = 0
+        fast_forward(self.params, self.cursor, self.cursor_t, t)
+        self.cursor_t = t
+        return copy.deepcopy(self.cursor)
+
+
+class Worker:
+    def __init__(self, cache_size: int = 8) -> None:
+        self.cache_size = max(1, cache_size)
+        self.fixtures: "OrderedDict[Tuple[Tuple[str, Any], ...], WarmFixture]" = OrderedDict()
+        self.defaults = vars(parse_cli_args([]))
+        self.lock = threading.Lock()
+        self.running = True
+
+    def fixture(self, config: Optional[Dict[str, Any]]) -> WarmFixture:
+        config = config or {}
+        unknown = set(config) - set(SETUP_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown config keys: {sorted(unknown)}")
+        options = {key: config.get(key, self.defaults[key]) for key in SETUP_KEYS}
+        key = tuple(sorted(options.items()))
+        warm = self.fixtures.get(key)
+        if warm is not None:
+            self.fixtures.move_to_end(key)
+            return warm
+        args = argparse.Namespace(**{**self.defaults, **options})
+        params, compound_cfg, secrets, state = build_setup(args)
+        warm = WarmFixture(
+            args=args,
+            params=params,
+            compound_cfg=compound_cfg,
+            secrets=secrets,
+            pristine=state,
+            cursor=copy.deepcopy(state),
+        )
+        self.fixtures[key] = warm
+        while len(self.fixtures) > self.cache_size:
+            self.fixtures.popitem(last=False)
+        return warm
+
+    def run_op(self, request: Dict[str, Any]) -> Any:
+        op = request.get("op")
+        if op == "ping":
+            return "pong"
+        if op == "shutdown":
+            self.running = False
+            return "bye"
+
+        warm = self.fixture(request.get("config"))
+        params = warm.params
+        width = params.token_bytes * 2
+        if op == "params":
+            return {
+                "x": params.x,
+                "P": params.P,
+                "Q": params.Q,
+                "R": params.R,
+                "M": params.M,
+                "token_bits": params.token_bits,
+                "period_bits": schedule_period(params).bit_length(),
+            }
+        if op == "route":
+            times = request["t"]
+            if isinstance(times, int):
+                return device_destination_provider(times, params, warm.pristine.perm_key)
+            return [device_destination_provider(t, params, warm.pristine.perm_key) for t in times]
+        if op == "lane_tokens":
+            t = int(request["t"])
+            lanes = [int(lane) for lane in request.get("lanes") or range(params.x)]
+            for lane in lanes:
+                if not 0 <= lane < params.x:
+                    raise ValueError(f"lane must be between 0 and {params.x - 1}, got {lane}")
+            phase = phase_clock(t, params)
+            return {
+                str(lane): f"{provider_cycle(t, lane, params, warm.secrets[lane], phase=phase):0{width}x}"
+                for lane in lanes
+            }
+        if op == "device":
+            start = int(request.get("start", 0))
+            cycles = int(request.get("cycles", 1))
+            state = warm.state_at(start)
+            out = []
+            for t in range(start, start + cycles):
+                idx, token = device_cycle(t, params, state)
+                out.append([idx, f"{token:0{width}x}"])
+            return out
+        if op == "validate":
+            start = int(request.get("start", 0))
+            cycles = int(request.get("cycles", warm.args.cycles))
+            state = warm.state_at(start)
+            validate_cycles(params, warm.secrets, state, start + cycles, start=start)
+            if request.get("chaining", False):
+                validate_chaining(params, warm.args.seed, warm.compound_cfg)
+            return {"start": start, "cycles": cycles}
+        raise ValueError(f"Unknown op: {op!r}")
+
+    def handle(self, request: Any) -> Dict[str, Any]:
+        if not isinstance(request, dict):
+            return {"id": None, "ok": False, "error": "request must be a JSON object"}
+        try:
+            with self.lock:
+                result = self.run_op(request)
+        except Exception as exc:
+            # A failing request must not take down the warm worker.
+            return {"id": request.get("id"), "ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        return {"id": request.get("id"), "ok": True, "result": result}
+
+    def handle_line(self, line: str) -> Optional[str]:
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as exc:
+            return json.dumps({"id": None, "ok": False, "error": f"bad JSON: {exc}"})
+        if isinstance(payload, list):
+            return json.dumps([self.handle(item) for item in payload])
+        return json.dumps(self.handle(payload))
+
+    def serve_lines(self, lines: Iterable[str], out: TextIO) -> None:
+        for line in lines:
+            response = self.handle_line(line)
+            if response is not None:
+                out.write(response + "\n")
+                out.flush()
+            if not self.running:
+                return
+
+
+def serve_unix_socket(worker: Worker, path: str) -> None:
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for raw in self.rfile:
+                response = worker.handle_line(raw.decode("utf-8"))
+                if response is not None:
+                    self.wfile.write(response.encode("utf-8") + b"\n")
+                    self.wfile.flush()
+                if not worker.running:
+                    threading.Thread(target=server.shutdown, daemon=True).start()
+                    return
+
+    if os.path.exists(path):
+        os.remove(path)
+    server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    server.daemon_threads = True
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Persistent PCPL worker (JSON lines).")
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default="",
+        help="Serve on this Unix socket path instead of stdin/stdout.",
+    )
+    parser.add_argument("--cache-size", type=int, default=8, help="Warm fixtures kept in memory.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    worker = Worker(cache_size=args.cache_size)
+    if args.socket:
+        serve_unix_socket(worker, args.socket)
+    else:
+        worker.serve_lines(sys.stdin, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()